@@ -1,5 +1,5 @@
 # 导入Flask核心模块
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, Response, stream_with_context, abort
 # 导入Flask-Login用户认证
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 # 导入数据库模型
@@ -8,22 +8,116 @@ from models import db, Task, User, TaskCategory
 from forms import LoginForm, UserRegistrationForm, UserEditForm, PasswordChangeForm, TaskForm, TaskCategoryForm
 # 导入权限装饰器
 from auth_decorators import admin_required, data_entry_required, role_required, check_task_edit_permission, check_task_view_permission, check_task_delete_permission, get_permission_denied_message
+# 导入分页工具
+from pagination import parse_limit, parse_sort, sort_order, keyset_paginate
+# 导入任务筛选工具
+from task_filters import SORT_FIELDS, FILTER_PARAMS, parse_task_filters, apply_task_filters, get_task_facets, parse_facets_flag
+# 导入批量导入工具
+from bulk_import import iter_ndjson, iter_csv, import_tasks
+# 导入任务列式序列化工具
+from task_serialization import parse_fields, task_rows_query, row_to_dict
+# 导入模板片段缓存
+from fragment_cache import init_fragment_cache
+# 导入JSON序列化配置
+from json_provider import init_json_provider
+# 导入模板预编译和静态资源指纹工具
+from asset_pipeline import init_asset_pipeline, precompile_templates
+# 导入任务导出工具
+from task_export import iter_export_rows, generate_ndjson, generate_csv
+# 导入进度批量更新工具
+from progress_service import validate_progress, load_progress_targets, apply_progress_updates
+# 导入进度写入缓冲
+from progress_buffer import progress_buffer, init_progress_buffer, accepted_progress
+# 导入全文搜索工具
+from search_service import search_index_exists, search_task_ids, load_tasks_in_order
+# 导入登录用户缓存
+from identity_cache import configure_user_cache, load_cached_user, bump_user_version
+# 导入密码哈希配置
+from password_hashing import configure_password_hashing, PasswordHasherBusy
+# 导入SQLite连接调优
+from sqlite_tuning import install_sqlite_pragmas, pool_options
+# 导入读写分离工具
+from db_routing import REPLICA_BIND_KEY, read_only_db, init_db_routing, copy_primary_to_replica
+# 导入HTTP条件请求工具
+from conditional_requests import collection_etag, task_etag, not_modified_response, if_match_failed, set_etag
+# 导入任务变更推送工具
+from change_feed import RECONNECT_DELAY_MS, notifier, stream_limiter, latest_change_seq, parse_last_event_id, stream_task_events, load_changes_since, ChangeLogExpired, prune_change_log
+# 导入数据库初始化工具
+from db_setup import init_database, seed_sample_data
+# 导入统计服务
+from stats_service import get_task_stats, build_stats, get_stats_breakdowns, rebuild_task_stats, DEFAULT_BREAKDOWN_SIZE, MAX_BREAKDOWN_SIZE
+import io
 import os
 # 导入日期时间处理模块
-from datetime import datetime, date
+from datetime import datetime
 
 def create_app():
     """应用工厂模式，创建并配置Flask应用"""
     app = Flask(__name__)
     
     # 应用配置
-    app.config['SECRET_KEY'] = 'your-secret-key-change-in-production'  # 密钥，生产环境需更改
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///task_progress.db'  # SQLite数据库路径
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')  # 密钥，生产环境需通过环境变量设置
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///task_progress.db')  # 数据库路径，可通过环境变量覆盖
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False  # 关闭修改跟踪，提升性能
+    app.config['DB_POOL_SIZE'] = 10  # 连接池保持的连接数（建议不小于每个进程的工作线程数）
+    app.config['DB_MAX_OVERFLOW'] = 20  # 连接池满时允许额外创建的连接数
+    app.config['DB_POOL_TIMEOUT'] = 30  # 等待空闲连接的秒数
+    if os.environ.get('DATABASE_REPLICA_URL'):
+        # 只读副本：只读接口的查询路由到副本，写操作使用主库
+        app.config['SQLALCHEMY_BINDS'] = {REPLICA_BIND_KEY: os.environ['DATABASE_REPLICA_URL']}
+    app.config['REPLICA_STICKY_SECONDS'] = 5  # 用户写入后在这段时间内读主库，保证读到自己的修改
+    app.config['SQLITE_JOURNAL_MODE'] = 'WAL'  # 日志模式，WAL允许读写并发
+    app.config['SQLITE_SYNCHRONOUS'] = 'NORMAL'  # 同步级别
+    app.config['SQLITE_BUSY_TIMEOUT_MS'] = 5000  # 数据库锁定时的等待毫秒数
+    app.config['SQLITE_MMAP_SIZE'] = 256 * 1024 * 1024  # 内存映射读取的最大字节数
     app.config['WTF_CSRF_ENABLED'] = True  # 启用CSRF保护
+    app.config['BULK_IMPORT_CHUNK_SIZE'] = 1000  # 批量导入时每个事务插入的行数
+    app.config['PROGRESS_BATCH_MAX_ITEMS'] = 500  # 批量更新进度时单次请求的最大任务数
+    app.config['PROGRESS_WRITE_MODE'] = os.environ.get('PROGRESS_WRITE_MODE', 'immediate')  # 进度更新写入模式：immediate 每次立即提交；buffered 合并后批量提交（进程崩溃时可能丢失最近的更新）
+    app.config['PROGRESS_FLUSH_SECONDS'] = 0.5  # buffered 模式下合并写入的时间窗口
+    app.config['PROGRESS_BUFFER_MAX_PENDING'] = 500  # buffered 模式下缓冲的任务数达到该值时立即写入
+    app.config['USER_CACHE_TTL'] = 30  # 登录用户缓存秒数
+    app.config['USER_CACHE_CHECK_SECONDS'] = 1.0  # 检查用户表版本的间隔（其他进程中的用户修改最多延迟这么久生效）
+    app.config['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:600000'  # 密码哈希算法和参数，修改后用户下次登录时自动升级
+    app.config['PASSWORD_HASH_WORKERS'] = 4  # 并行计算密码哈希的线程数
+    app.config['PASSWORD_HASH_MAX_PENDING'] = 64  # 正在执行和排队的密码哈希任务上限
+    app.config['TASK_STREAM_POLL_SECONDS'] = 2  # 事件流检查其他进程写入的间隔（每个进程每个间隔最多查询一次）
+    app.config['TASK_STREAM_HEARTBEAT_SECONDS'] = 15  # 无变更时发送心跳的间隔
+    app.config['TASK_STREAM_MAX_SECONDS'] = 300  # 单个事件流连接的最长持续时间，到期后客户端自动重连
+    app.config['TASK_STREAM_BATCH_SIZE'] = 200  # 事件流每次读取的最大变更条数
+    app.config['TASK_STREAM_MAX_CONNECTIONS'] = 4  # 同步WSGI服务下每个进程同时打开的事件流上限（每个事件流占用一个工作线程，应小于线程数），超出返回503；异步入口不受此限制
+    app.config['TASK_CHANGES_MAX_LIMIT'] = 1000  # 增量同步接口单次最多读取的变更条数
+    app.config['TASK_CHANGES_RETENTION_DAYS'] = 30  # prune-changes 命令保留变更日志的天数
+    app.config['JSON_USE_ORJSON'] = True  # 已安装orjson时使用它编码JSON响应
+    app.config['FRAGMENT_CACHE_SIZE'] = 4096  # 任务列表渲染片段缓存的最大条目数
+    app.config['TEMPLATE_BYTECODE_CACHE_DIR'] = os.path.join(app.instance_path, 'jinja_cache')  # 模板字节码缓存目录，设为None则禁用
+    app.config['SEARCH_FTS_ENABLED'] = None  # 全文索引是否可用，搜索时检测，检测到可用后不再检查
+    app.config['TEMPLATE_WARMUP'] = True  # 启动时预编译全部模板，首个请求无需编译
+    
+    # 根据配置设置连接池大小（内存数据库使用StaticPool，不设置）
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = pool_options(app.config['SQLALCHEMY_DATABASE_URI'], app.config)
+    
+    # 配置JSON序列化
+    init_json_provider(app)
+    # 注册任务片段缓存的模板函数
+    init_fragment_cache(app)
+    # 进度写入缓冲
+    init_progress_buffer(app)
+    # 模板字节码缓存和静态资源指纹
+    init_asset_pipeline(app)
+    if app.config['TEMPLATE_WARMUP']:
+        precompile_templates(app)
     
     # 初始化数据库
     db.init_app(app)
+    init_db_routing(app)
+    
+    # 初始化密码哈希线程池
+    configure_password_hashing(
+        app.config['PASSWORD_HASH_METHOD'],
+        app.config['PASSWORD_HASH_WORKERS'],
+        app.config['PASSWORD_HASH_MAX_PENDING']
+    )
     
     # 初始化Flask-Login
     login_manager = LoginManager()
@@ -32,144 +126,26 @@ def create_app():
     login_manager.login_message = '请先登录才能访问此页面。'
     login_manager.login_message_category = 'warning'
     
+    configure_user_cache(app.config['USER_CACHE_TTL'], app.config['USER_CACHE_CHECK_SECONDS'])
+    
     @login_manager.user_loader
     def load_user(user_id):
-        """加载用户回调函数"""
-        return User.query.get(int(user_id))
+        """加载用户回调函数（使用短时缓存，避免每个请求查询用户表）"""
+        return load_cached_user(int(user_id))
     
+    # 启动时不访问数据库：建表、迁移和默认数据由 flask init-db / flask seed 命令完成
     with app.app_context():
-        db.create_all()  # 创建所有数据库表
-        
-        # 创建默认管理员账户（如果不存在）
-        admin_user = User.query.filter_by(username='admin').first()
-        if not admin_user:
-            admin_user = User(
-                username='admin',
-                full_name='系统管理员',
-                role='admin',
-                is_active=True
-            )
-            admin_user.set_password('admin123')  # 默认密码，生产环境需修改
-            db.session.add(admin_user)
-            db.session.commit()
-        
-        # 创建默认任务分类（如果不存在）
-        if TaskCategory.query.count() == 0:
-            default_categories = [
-                TaskCategory.create_category('general', '通用任务', '默认的通用任务分类', 'secondary', True, 0),
-                TaskCategory.create_category('development', '开发任务', '软件开发相关任务', 'primary', True, 1),
-                TaskCategory.create_category('design', '设计任务', 'UI/UX设计相关任务', 'info', True, 2),
-                TaskCategory.create_category('testing', '测试任务', '软件测试相关任务', 'warning', True, 3),
-                TaskCategory.create_category('deployment', '部署任务', '系统部署相关任务', 'success', True, 4),
-                TaskCategory.create_category('meeting', '会议任务', '会议和沟通相关任务', 'dark', True, 5),
-                TaskCategory.create_category('research', '研究任务', '研究和调研相关任务', 'light', True, 6)
-            ]
-            
-            for category in default_categories:
-                db.session.add(category)
-            
-            db.session.commit()
-        
-        # 如果数据库为空，添加示例数据
-        if Task.query.count() == 0:
-            # 创建示例用户
-            sample_users = [
-                User(
-                    username='data_entry1',
-                    full_name='录入员一',
-                    role='data_entry',
-                    is_active=True
-                ),
-                User(
-                    username='supervisor1',
-                    full_name='监督员一',
-                    role='supervisor',
-                    is_active=True
-                )
-            ]
-            
-            for user in sample_users:
-                user.set_password('123456')  # 默认密码
-                db.session.add(user)
-            
-            db.session.commit()
-            
-            # 获取创建的用户ID
-            data_entry_user = User.query.filter_by(username='data_entry1').first()
-            
-            # 确保用户存在
-            if not data_entry_user:
-                raise Exception('无法创建示例任务：找不到data_entry1用户')
-            
-            sample_tasks = [
-                Task.create_task(
-                    title="搭建开发环境", 
-                    description="安装Python、Flask和相关依赖包，配置开发环境", 
-                    status="completed", 
-                    progress=100,
-                    planned_start_date=date(2024, 1, 1), 
-                    planned_end_date=date(2024, 1, 5),
-                    assignee="张三", 
-                    category="development",
-                    creator_id=data_entry_user.id
-                ),
-                Task.create_task(
-                    title="设计数据库架构", 
-                    description="创建SQLAlchemy数据模型，设计任务管理数据表结构", 
-                    status="completed", 
-                    progress=100,
-                    planned_start_date=date(2024, 1, 6), 
-                    planned_end_date=date(2024, 1, 10),
-                    assignee="李四", 
-                    category="development",
-                    creator_id=data_entry_user.id
-                ),
-                Task.create_task(
-                    title="实现后端API接口", 
-                    description="开发Flask路由和RESTful API接口，实现CRUD操作", 
-                    status="in-progress", 
-                    progress=75,
-                    planned_start_date=date(2024, 1, 11), 
-                    planned_end_date=date(2024, 1, 20),
-                    assignee="王五", 
-                    category="development",
-                    creator_id=data_entry_user.id
-                ),
-                Task.create_task(
-                    title="创建前端页面模板", 
-                    description="使用Bootstrap设计响应式HTML模板和用户界面", 
-                    status="pending", 
-                    progress=0,
-                    planned_start_date=date(2024, 1, 21), 
-                    planned_end_date=date(2024, 1, 30),
-                    assignee="赵六", 
-                    category="design",
-                    creator_id=data_entry_user.id
-                ),
-                Task.create_task(
-                    title="添加用户认证系统", 
-                    description="实现用户登录、注册和权限管理功能模块", 
-                    status="pending", 
-                    progress=0,
-                    planned_start_date=date(2024, 2, 1), 
-                    planned_end_date=date(2024, 2, 15),
-                    assignee="钱七", 
-                    category="development",
-                    creator_id=data_entry_user.id
-                )
-            ]
-            
-            # 将示例任务添加到数据库
-            for task in sample_tasks:
-                db.session.add(task)
-            
-            db.session.commit()  # 提交数据库事务
+        for engine in db.engines.values():
+            install_sqlite_pragmas(engine, app.config)  # 为每个SQLite连接设置PRAGMA（连接建立时执行）
     
     return app
 
 # 创建Flask应用实例
 app = create_app()
 
+# 仪表板显示的最近任务数量
+RECENT_TASKS_LIMIT = 5
+
 # ========== 认证路由 (用户登录、注册、管理) ==========
 
 @app.route('/login', methods=['GET', 'POST'])
@@ -186,11 +162,25 @@ def login():
     if form.validate_on_submit():
         user = User.query.filter_by(username=form.username.data).first()
         
-        if user and user.check_password(form.password.data):
+        try:
+            password_ok = user is not None and user.check_password(form.password.data)
+        except PasswordHasherBusy as e:
+            flash(str(e), 'warning')
+            return render_template('login.html', form=form), 503
+        
+        if password_ok:
             if not user.is_active:
                 flash('您的账户已被禁用，请联系管理员', 'danger')
                 return render_template('login.html', form=form)
             
+            # 哈希算法或参数已调整时，用本次登录的明文密码透明升级哈希
+            if user.password_needs_rehash():
+                try:
+                    user.set_password(form.password.data)
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+            
             login_user(user)
             flash(f'欢迎，{user.full_name}!', 'success')
             
@@ -236,6 +226,7 @@ def admin_add_user():
             
             db.session.add(user)
             db.session.commit()
+            bump_user_version(user.id)  # 用户ID可能被复用，清除该ID的缓存
             
             flash(f'用户 {user.full_name} 创建成功！', 'success')
             return redirect(url_for('admin_users'))
@@ -262,6 +253,7 @@ def admin_edit_user(user_id):
             user.updated_at = datetime.utcnow()
             
             db.session.commit()
+            bump_user_version(user.id)  # 角色和激活状态变更立即生效
             flash(f'用户 {user.full_name} 信息更新成功！', 'success')
             return redirect(url_for('admin_users'))
             
@@ -284,6 +276,7 @@ def admin_reset_password(user_id):
             user.updated_at = datetime.utcnow()
             
             db.session.commit()
+            bump_user_version(user.id)
             flash(f'用户 {user.full_name} 的密码重置成功！', 'success')
             return redirect(url_for('admin_users'))
             
@@ -312,6 +305,7 @@ def admin_delete_user(user_id):
         
         db.session.delete(user)
         db.session.commit()
+        bump_user_version(user.id)  # 已删除用户的会话立即失效
         
         flash(f'用户 {user.full_name} 已被删除', 'success')
     except Exception as e:
@@ -417,57 +411,53 @@ def admin_delete_category(category_id):
 
 @app.route('/')
 @login_required
+@read_only_db
 def index():
     """主页，显示任务概览和统计信息"""
     # 管理员重定向到用户管理页面
     if current_user.role == 'admin':
         return redirect(url_for('admin_users'))
     
-    # 获取当前用户可以查看的任务
-    if current_user.role == 'data_entry':
-        # 录入员可以查看所有任务，但只能编辑自己创建的
-        tasks = Task.query.order_by(Task.created_at.desc()).all()
-    elif current_user.role == 'supervisor':
-        # 监督员可以查看所有任务
-        tasks = Task.query.order_by(Task.created_at.desc()).all()
+    # 获取当前用户可以查看的任务（仪表板只展示最近的任务）
+    if current_user.role in ['data_entry', 'supervisor']:
+        # 录入员可以查看所有任务，但只能编辑自己创建的；监督员可以查看所有任务
+        tasks = Task.query_with_relations().order_by(Task.created_at.desc(), Task.id.desc()).limit(RECENT_TASKS_LIMIT).all()
+        # 在数据库端聚合计算任务统计数据
+        stats = get_task_stats()
     else:
         tasks = []
-    
-    # 计算任务统计数据
-    total_tasks = len(tasks)  # 总任务数
-    completed_tasks = len([t for t in tasks if t.status == 'completed'])  # 已完成任务数
-    in_progress_tasks = len([t for t in tasks if t.status == 'in-progress'])  # 进行中任务数
-    pending_tasks = len([t for t in tasks if t.status == 'pending'])  # 待处理任务数
-    
-    # 计算完成率
-    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-    
-    # 组织统计数据
-    stats = {
-        'total_tasks': total_tasks,
-        'completed_tasks': completed_tasks,
-        'in_progress_tasks': in_progress_tasks,
-        'pending_tasks': pending_tasks,
-        'completion_rate': round(completion_rate, 1)
-    }
+        stats = build_stats({})
     
     return render_template('index.html', tasks=tasks, stats=stats)
 
 @app.route('/tasks')
 @role_required('data_entry', 'supervisor')
+@read_only_db
 def tasks():
-    """任务管理页面，支持按状态筛选"""
+    """任务管理页面，支持按状态、分类、负责人、创建者、计划日期和进度筛选及排序"""
     # 获取筛选参数，默认显示所有任务
     filter_status = request.args.get('status', 'all')
     
-    if filter_status == 'all':
-        # 获取所有任务
-        tasks = Task.query.order_by(Task.created_at.desc()).all()
-    else:
-        # 按指定状态筛选任务
-        tasks = Task.query.filter_by(status=filter_status).order_by(Task.created_at.desc()).all()
+    try:
+        filters = parse_task_filters(request.args)
+        sort = parse_sort(request.args.get('sort'), SORT_FIELDS)
+    except ValueError as e:
+        flash(str(e), 'warning')
+        return redirect(url_for('tasks'))
+    
+    # 筛选和排序在数据库中完成
+    query = apply_task_filters(Task.query_with_relations(), filters)
+    tasks = query.order_by(*sort_order(Task, sort)).all()
+    
+    # 当前筛选条件（不含状态），状态按钮切换时保留
+    filter_args = {name: request.args[name] for name in FILTER_PARAMS
+                   if name != 'status' and request.args.get(name)}
+    if request.args.get('sort'):
+        filter_args['sort'] = sort
     
-    return render_template('tasks.html', tasks=tasks, current_filter=filter_status)
+    return render_template('tasks.html', tasks=tasks, current_filter=filter_status,
+                           filters=filters, filter_args=filter_args, current_sort=sort,
+                           facets=get_task_facets(filters))
 
 @app.route('/add_task', methods=['GET', 'POST'])
 @role_required('data_entry', 'supervisor')
@@ -576,28 +566,171 @@ def edit_task(task_id):
 
 @app.route('/api/tasks', methods=['GET'])
 @role_required('data_entry', 'supervisor')
+@read_only_db
 def api_get_tasks():
-    """获取所有任务或按状态筛选任务的API接口"""
+    """分页获取任务的API接口（游标分页），支持筛选、排序和分面计数（facets=1）"""
+    # 数据未变化时直接返回304，不查询和序列化任务
+    etag = collection_etag('tasks')
+    cached = not_modified_response(etag, weak=True)
+    if cached is not None:
+        return cached
+    
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        filters = parse_task_filters(request.args)
+        sort = parse_sort(request.args.get('sort'), SORT_FIELDS)
+        cursor = request.args.get('cursor')
+        # 只查询 fields 指定的列（另加分页所需的排序键），不构造ORM对象
+        fields = parse_fields(request.args.get('fields'))
+        query = apply_task_filters(task_rows_query(fields, extra_fields=(sort.lstrip('-'), 'id')), filters)
+        rows, next_cursor = keyset_paginate(query, Task, limit, cursor, sort)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    tasks = [row_to_dict(row, fields) for row in rows]
+    result = {
+        'tasks': tasks,
+        'count': len(tasks),
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None
+    }
+    if parse_facets_flag(request.args):
+        # 分面计数按需返回（facets=1），客户端通常只在第一页请求
+        result['facets'] = get_task_facets(filters)
+    response = jsonify(result)
+    return set_etag(response, etag, weak=True)
+
+@app.route('/api/tasks/export', methods=['GET'])
+@role_required('data_entry', 'supervisor')
+def api_export_tasks():
+    """流式导出任务API，支持 format=ndjson|csv 和按状态筛选"""
+    export_format = request.args.get('format', 'ndjson')
     filter_status = request.args.get('status')
     
-    if filter_status:
-        # 按状态筛选
-        tasks = Task.query.filter_by(status=filter_status).order_by(Task.created_at.desc()).all()
+    if export_format == 'ndjson':
+        generate, mimetype = generate_ndjson, 'application/x-ndjson'
+    elif export_format == 'csv':
+        generate, mimetype = generate_csv, 'text/csv'
     else:
-        # 获取所有任务
-        tasks = Task.query.order_by(Task.created_at.desc()).all()
+        return jsonify({'error': '导出格式只能是 ndjson 或 csv'}), 400
+    
+    # 生成器响应：边查询边输出，首字节立即返回，内存占用不随任务数增长
+    body = stream_with_context(generate(iter_export_rows(filter_status)))
+    return Response(body, mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename=tasks.{export_format}'
+    })
+
+@app.route('/api/tasks/stream', methods=['GET'])
+@role_required('data_entry', 'supervisor')
+def api_task_stream():
+    """任务变更事件流API（Server-Sent Events），支持通过 Last-Event-ID 断线续传"""
+    try:
+        last_seq = parse_last_event_id(request.headers.get('Last-Event-ID', request.args.get('last_event_id')))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # 每个事件流在连接期间占用一个工作线程，超过上限时拒绝，保证普通请求仍有线程可用
+    if not stream_limiter.try_acquire(app.config['TASK_STREAM_MAX_CONNECTIONS']):
+        response = jsonify({'error': '事件流连接数已达上限，请稍后重试'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(RECONNECT_DELAY_MS // 1000)
+        return response
+    
+    if last_seq is None:
+        # 新连接只推送此后的变更
+        last_seq = latest_change_seq()
+        notifier.observe(last_seq)
+    
+    body = stream_with_context(stream_task_events(
+        last_seq,
+        poll_interval=app.config['TASK_STREAM_POLL_SECONDS'],
+        heartbeat_interval=app.config['TASK_STREAM_HEARTBEAT_SECONDS'],
+        max_seconds=app.config['TASK_STREAM_MAX_SECONDS'],
+        batch_size=app.config['TASK_STREAM_BATCH_SIZE']
+    ))
+    response = Response(body, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # 禁止反向代理缓冲事件
+    })
+    # 连接结束（包括客户端断开）时服务器关闭响应，归还名额
+    response.call_on_close(stream_limiter.release)
+    return response
+
+@app.route('/api/tasks/changes', methods=['GET'])
+@role_required('data_entry', 'supervisor')
+@read_only_db
+def api_task_changes():
+    """增量同步API：返回变更序号 since 之后新增或修改的任务，以及已删除任务的ID"""
+    try:
+        since = int(request.args['since'])
+        if since < 0:
+            raise ValueError
+    except (KeyError, ValueError):
+        return jsonify({'error': 'since必须是非负整数（变更序号）'}), 400
+    
+    try:
+        limit = parse_limit(request.args.get('limit'), app.config['TASK_CHANGES_MAX_LIMIT'], app.config['TASK_CHANGES_MAX_LIMIT'])
+        return jsonify(load_changes_since(since, limit))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except ChangeLogExpired as e:
+        # 客户端记下 latest_seq，全量获取任务列表后从该序号继续增量同步
+        return jsonify({'error': str(e), 'latest_seq': e.latest_seq}), 410
+
+@app.route('/api/tasks/search', methods=['GET'])
+@role_required('data_entry', 'supervisor')
+def api_search_tasks():
+    """全文搜索任务API，在标题、描述和负责人中搜索，按相关度排序并分页"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': '搜索关键词不能为空'}), 400
+    
+    try:
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        page = int(request.args.get('page', 1))
+    except ValueError:
+        page = 0
+    if page < 1:
+        return jsonify({'error': 'page必须是正整数'}), 400
+    
+    # 多取一条用于判断是否还有下一页
+    # 只缓存检测到索引的结果：进程先于 flask init-db 处理搜索时，建好索引后的下一次搜索即改用全文索引
+    fts_enabled = app.config['SEARCH_FTS_ENABLED']
+    if not fts_enabled:
+        fts_enabled = search_index_exists()
+        if fts_enabled:
+            app.config['SEARCH_FTS_ENABLED'] = True
+    task_ids = search_task_ids(query, limit + 1, (page - 1) * limit, fts_enabled)
+    tasks = load_tasks_in_order(task_ids[:limit])
     
     return jsonify({
         'tasks': [task.to_dict() for task in tasks],
-        'count': len(tasks)
+        'count': len(tasks),
+        'page': page,
+        'has_more': len(task_ids) > limit
     })
 
 @app.route('/api/tasks/<int:task_id>', methods=['GET'])
 @role_required('data_entry', 'supervisor')
+@read_only_db
 def api_get_task(task_id):
-    """获取单个任务的API接口"""
-    task = Task.query.get_or_404(task_id)
-    return jsonify({'task': task.to_dict()})
+    """获取单个任务的API接口，支持 fields 参数只返回指定字段"""
+    try:
+        fields = parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    row = task_rows_query(fields, extra_fields=('id', 'updated_at')).filter(Task.id == task_id).first()
+    if row is None:
+        abort(404)
+    etag = task_etag(row)
+    cached = not_modified_response(etag)
+    if cached is not None:
+        return cached
+    return set_etag(jsonify({'task': row_to_dict(row, fields)}), etag)
 
 @app.route('/api/tasks', methods=['POST'])
 @role_required('data_entry', 'supervisor')
@@ -643,6 +776,35 @@ def api_create_task():
         db.session.rollback()
         return jsonify({'error': '创建任务时发生错误'}), 500
 
+@app.route('/api/tasks/bulk', methods=['POST'])
+@role_required('data_entry', 'supervisor')
+def api_bulk_import_tasks():
+    """批量导入任务API，请求体为NDJSON（application/x-ndjson）或带表头的CSV（text/csv）"""
+    content_type = request.mimetype
+    if content_type in ('application/x-ndjson', 'application/jsonl'):
+        parser = iter_ndjson
+    elif content_type == 'text/csv':
+        parser = iter_csv
+    else:
+        return jsonify({'error': '仅支持 application/x-ndjson 或 text/csv 格式'}), 415
+    
+    try:
+        chunk_size = int(request.args.get('chunk_size', app.config['BULK_IMPORT_CHUNK_SIZE']))
+        if chunk_size < 1:
+            raise ValueError
+    except ValueError:
+        return jsonify({'error': 'chunk_size必须是正整数'}), 400
+    
+    # 直接从请求体流式读取，不把整个文件读入内存
+    stream = io.TextIOWrapper(request.stream, encoding='utf-8', newline='')
+    try:
+        result = import_tasks(parser(stream), current_user.id, chunk_size)
+    except UnicodeDecodeError:
+        db.session.rollback()
+        return jsonify({'error': '请求体必须是UTF-8编码'}), 400
+    
+    return jsonify(result)
+
 @app.route('/api/tasks/<int:task_id>', methods=['PUT'])
 @role_required('data_entry', 'supervisor')
 def api_update_task(task_id):
@@ -656,6 +818,10 @@ def api_update_task(task_id):
             error_message = get_permission_denied_message(task, '修改')
             return jsonify({'error': error_message}), 403
         
+        # 乐观并发控制：客户端持有的版本已过期时拒绝更新
+        if if_match_failed(task_etag(task)):
+            return jsonify({'error': '任务已被其他用户修改，请刷新后重试'}), 412
+        
         data = request.get_json()
         
         if not data:
@@ -671,7 +837,7 @@ def api_update_task(task_id):
             task.update_task(**update_fields)
             db.session.commit()
         
-        return jsonify({'task': task.to_dict()})
+        return set_etag(jsonify({'task': task.to_dict()}), task_etag(task))
         
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
@@ -704,7 +870,9 @@ def api_delete_task(task_id):
 @app.route('/api/tasks/<int:task_id>/progress', methods=['PUT'])
 @role_required('data_entry', 'supervisor')
 def api_update_progress(task_id):
-    """更新任务进度API"""
+    """更新任务进度API（PROGRESS_WRITE_MODE=buffered 时进入写入缓冲，返回202）"""
+    if app.config['PROGRESS_WRITE_MODE'] == 'buffered':
+        return buffer_progress_update(task_id)
     try:
         task = Task.query.get_or_404(task_id)
         
@@ -738,25 +906,155 @@ def api_update_progress(task_id):
         db.session.rollback()
         return jsonify({'error': '更新进度时发生错误'}), 500
 
+def buffer_progress_update(task_id):
+    """校验权限和进度后写入缓冲立即返回，同一任务在写入窗口内的多次更新合并为一次提交"""
+    target = load_progress_targets([task_id]).get(task_id)
+    if target is None:
+        abort(404)
+    
+    # 检查编辑权限（只需创建者ID；拒绝时再加载任务生成提示信息）
+    if not check_task_edit_permission(target):
+        error_message = get_permission_denied_message(db.session.get(Task, task_id), '修改')
+        return jsonify({'error': error_message}), 403
+    
+    data = request.get_json(silent=True)
+    if not data or 'progress' not in data:
+        return jsonify({'error': '进度值是必需的'}), 400
+    
+    progress = data['progress']
+    try:
+        validate_progress(progress)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    progress_buffer.submit(task_id, progress)
+    return jsonify(accepted_progress(task_id, progress, target.status)), 202
+
+@app.route('/api/progress/metrics', methods=['GET'])
+@login_required
+def api_progress_metrics():
+    """进度写入缓冲的统计（合并掉的更新数、节省的提交次数等）"""
+    metrics = progress_buffer.metrics()
+    metrics['mode'] = app.config['PROGRESS_WRITE_MODE']
+    metrics['flush_seconds'] = app.config['PROGRESS_FLUSH_SECONDS']
+    return jsonify(metrics)
+
+@app.route('/api/tasks/progress:batch', methods=['PUT'])
+@role_required('data_entry', 'supervisor')
+def api_batch_update_progress():
+    """批量更新任务进度API，请求体为 [{"id": 任务ID, "progress": 进度}]，在一个事务内提交"""
+    items = request.get_json(silent=True)
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': '请求体必须是非空的任务进度列表'}), 400
+    if len(items) > app.config['PROGRESS_BATCH_MAX_ITEMS']:
+        return jsonify({'error': f'单次最多更新 {app.config["PROGRESS_BATCH_MAX_ITEMS"]} 个任务'}), 400
+    
+    # 校验请求数据，同一任务出现多次时以最后一次为准
+    updates, errors = {}, []
+    for index, item in enumerate(items):
+        task_id = item.get('id') if isinstance(item, dict) else None
+        if isinstance(task_id, bool) or not isinstance(task_id, int):
+            errors.append({'index': index, 'id': task_id, 'error': '任务ID必须是整数'})
+            continue
+        try:
+            validate_progress(item.get('progress'))
+        except ValueError as e:
+            errors.append({'index': index, 'id': task_id, 'error': str(e)})
+            continue
+        updates[task_id] = item['progress']
+    
+    try:
+        # 一次查询取出所有任务，逐个检查编辑权限
+        targets = load_progress_targets(list(updates))
+        for task_id in list(updates):
+            target = targets.get(task_id)
+            if target is None:
+                errors.append({'id': task_id, 'error': '任务不存在'})
+            elif not check_task_edit_permission(target):
+                errors.append({'id': task_id, 'error': '您没有权限修改此任务'})
+            else:
+                continue
+            del updates[task_id]
+        
+        results = apply_progress_updates(updates, targets)
+        db.session.commit()
+        
+        return jsonify({'tasks': results, 'errors': errors})
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': '更新进度时发生错误'}), 500
+
 @app.route('/api/stats')
+@read_only_db
 def api_get_stats():
     """Get task statistics"""
-    tasks = Task.query.all()
+    etag = collection_etag('stats')
+    cached = not_modified_response(etag, weak=True)
+    if cached is not None:
+        return cached
     
-    total_tasks = len(tasks)
-    completed_tasks = len([t for t in tasks if t.status == 'completed'])
-    in_progress_tasks = len([t for t in tasks if t.status == 'in-progress'])
-    pending_tasks = len([t for t in tasks if t.status == 'pending'])
+    # 统计数据由写入任务时增量维护的统计表提供，只读取全部任务汇总行
+    return set_etag(jsonify(get_task_stats()), etag, weak=True)
+
+@app.route('/api/stats/breakdowns')
+@role_required('admin', 'supervisor')
+@read_only_db
+def api_get_stats_breakdowns():
+    """按分类、创建者、负责人的分组统计，每个维度返回任务数最多的前 limit 行（含人员姓名，需要登录）"""
+    try:
+        limit = parse_limit(request.args.get('limit'), DEFAULT_BREAKDOWN_SIZE, MAX_BREAKDOWN_SIZE)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+    etag = collection_etag(f'stats-breakdowns:{limit}')
+    cached = not_modified_response(etag, weak=True)
+    if cached is not None:
+        return cached
     
-    return jsonify({
-        'total_tasks': total_tasks,
-        'completed_tasks': completed_tasks,
-        'in_progress_tasks': in_progress_tasks,
-        'pending_tasks': pending_tasks,
-        'completion_rate': round(completion_rate, 1)
-    })
+    return set_etag(jsonify(get_stats_breakdowns(limit)), etag, weak=True)
+
+# ========== 命令行工具 ==========
+
+@app.cli.command('init-db')
+def init_db_command():
+    """创建数据库表、索引和触发器，并写入默认管理员和默认分类（可重复执行，升级后也需执行）"""
+    fts_enabled = init_database()
+    print(f'数据库已初始化（全文搜索: {"FTS5" if fts_enabled else "LIKE"}）')
+
+@app.cli.command('seed')
+def seed_command():
+    """数据库中没有任务时写入示例用户和示例任务（需先执行 init-db）"""
+    if seed_sample_data():
+        print('示例数据已写入')
+    else:
+        print('数据库中已有任务，未写入示例数据')
+
+@app.cli.command('rebuild-stats')
+def rebuild_stats_command():
+    """根据任务表全量重新计算任务统计表"""
+    summary = rebuild_task_stats()
+    print(f'任务统计已重建，共 {summary.total} 个任务')
+
+@app.cli.command('prune-changes')
+def prune_changes_command():
+    """删除超过保留天数的任务变更日志"""
+    deleted = prune_change_log(app.config['TASK_CHANGES_RETENTION_DAYS'])
+    print(f'已删除 {deleted} 条过期的任务变更日志')
+
+@app.cli.command('build-assets')
+def build_assets_command():
+    """预编译全部模板到字节码缓存，并生成静态资源指纹清单（部署时执行）"""
+    templates = precompile_templates(app)
+    assets = app.extensions['asset_fingerprints'].build()
+    print(f'已预编译 {templates} 个模板，生成 {assets} 个静态资源指纹')
+
+@app.cli.command('sync-replica')
+def sync_replica_command():
+    """将主库复制到只读副本（本地测试读写分离用）"""
+    copy_primary_to_replica(db)
+    print('只读副本已同步')
 
 # Error handlers
 
@@ -774,4 +1072,7 @@ def internal_error(error):
     return render_template('500.html'), 500
 
 if __name__ == '__main__':
+    # 开发服务器启动前初始化数据库并写入示例数据
+    with app.app_context():
+        init_database(with_samples=True)
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
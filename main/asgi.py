@@ -0,0 +1,14 @@
+# 异步（ASGI）入口：任务和统计接口由 async_api 的异步处理函数执行，其余请求交给Flask
+# 需要额外安装: pip install -r requirements-async.txt（aiosqlite greenlet asgiref uvicorn）
+# 使用 uvicorn:  uvicorn asgi:application --host 0.0.0.0 --port 8000
+# 或直接运行:     python asgi.py
+import os
+from asgiref.wsgi import WsgiToAsgi
+from app import app
+from async_api import AsyncTaskAPI
+
+application = AsyncTaskAPI(app, fallback=WsgiToAsgi(app))
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(application, host=os.environ.get('HOST', '0.0.0.0'), port=int(os.environ.get('PORT', 8000)))
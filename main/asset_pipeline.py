@@ -0,0 +1,111 @@
+# 模板预编译和静态资源指纹模块 - 模板字节码缓存到磁盘，静态资源URL带内容哈希并设置长期缓存
+import hashlib
+import json
+import os
+import threading
+from flask import request
+from jinja2 import FileSystemBytecodeCache
+
+# 静态资源URL中的指纹参数名
+FINGERPRINT_PARAM = 'v'
+# 带正确指纹的静态资源缓存一年（内容变化后URL随之变化）
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+# 静态资源指纹清单文件名（保存在实例目录）
+ASSET_MANIFEST = 'asset-manifest.json'
+
+def file_fingerprint(path):
+    """文件内容的短哈希"""
+    digest = hashlib.md5(usedforsecurity=False)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+class AssetFingerprints:
+    """
+    静态资源指纹表：文件名 -> (修改时间, 大小, 指纹)
+    优先使用构建时生成的清单；文件修改时间或大小变化时重新计算，开发时修改文件也不会返回旧指纹
+    """
+
+    def __init__(self, static_folder, manifest_path):
+        self.static_folder = static_folder
+        self.manifest_path = manifest_path
+        self._entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                self._entries = {name: tuple(entry) for name, entry in json.load(f).items()}
+
+    def get(self, filename):
+        """返回静态文件的指纹，文件不存在时返回None"""
+        path = os.path.join(self.static_folder, filename)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        entry = self._entries.get(filename)
+        if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+            entry = (stat.st_mtime_ns, stat.st_size, file_fingerprint(path))
+            with self._lock:
+                self._entries[filename] = entry
+        return entry[2]
+
+    def build(self):
+        """计算全部静态文件的指纹并写入清单，返回文件数"""
+        for root, _, files in os.walk(self.static_folder):
+            for name in files:
+                relative = os.path.relpath(os.path.join(root, name), self.static_folder)
+                self.get(relative.replace(os.sep, '/'))
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, indent=2, sort_keys=True)
+        return len(self._entries)
+
+def precompile_templates(app):
+    """
+    加载（编译）全部模板：写入字节码缓存，并填充当前进程的模板缓存
+    返回: 模板数量
+    """
+    names = app.jinja_env.list_templates(extensions=['html'])
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
+
+def init_asset_pipeline(app):
+    """
+    配置模板字节码缓存和静态资源指纹
+    - url_for('static', ...) 自动带上内容指纹参数
+    - 指纹正确的静态资源返回长期缓存头，其余静态请求要求浏览器重新验证
+    """
+    cache_dir = app.config['TEMPLATE_BYTECODE_CACHE_DIR']
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
+    fingerprints = AssetFingerprints(app.static_folder, os.path.join(app.instance_path, ASSET_MANIFEST))
+    app.extensions['asset_fingerprints'] = fingerprints
+
+    @app.url_defaults
+    def add_static_fingerprint(endpoint, values):
+        if endpoint == 'static' and FINGERPRINT_PARAM not in values:
+            fingerprint = fingerprints.get(values.get('filename', ''))
+            if fingerprint:
+                values[FINGERPRINT_PARAM] = fingerprint
+
+    @app.after_request
+    def set_static_cache_headers(response):
+        if request.endpoint != 'static':
+            return response
+        version = request.args.get(FINGERPRINT_PARAM)
+        if version and version == fingerprints.get(request.view_args.get('filename', '')):
+            response.cache_control.no_cache = None  # 去掉send_file默认的no-cache
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            # 没有指纹或指纹已过期：允许缓存但每次使用前重新验证
+            response.cache_control.no_cache = True
+            response.cache_control.max_age = None
+        return response
+
+    return fingerprints
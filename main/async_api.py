@@ -0,0 +1,551 @@
+# 异步任务API模块 - 在ASGI服务器上用异步SQLAlchemy（aiosqlite）处理任务和统计接口
+# 与同步Flask视图共用参数解析、查询构造、数据校验（Task.create_task / update_task）和权限规则，
+# 任务变更事件流在事件循环中等待，不占用线程；未匹配的请求（页面、导出、批量接口等）交给Flask处理
+import asyncio
+import json
+import logging
+import re
+import time
+from contextlib import aclosing
+from urllib.parse import parse_qsl
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, joinedload
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import parse_etags, quote_etag
+from werkzeug.test import EnvironBuilder
+from flask import request as flask_request, session as flask_session
+from flask_login.config import COOKIE_NAME
+from flask_login.utils import decode_cookie
+from cache_utils import MISSING
+from models import db, Task, User, TaskCategory, TaskStat, CategoryInfo, category_cache
+from identity_cache import (user_cache_version, get_cached_user, cache_user,
+                            users_version_check_due, users_version_select, observe_users_version)
+from auth_decorators import check_task_edit_permission, get_permission_denied_message
+from pagination import parse_limit, parse_sort, keyset_window, keyset_page
+from task_filters import (SORT_FIELDS, parse_task_filters, apply_task_filters, parse_facets_flag,
+                          uses_stat_facets, stat_facets_select, stat_facet_rows, task_facets_select, summarize_task_facets)
+from task_serialization import TASK_FIELDS, parse_fields, task_rows_select, row_to_dict
+from progress_service import status_for_progress, validate_progress
+from progress_buffer import progress_buffer, accepted_progress
+from conditional_requests import collection_version_select, collection_version, collection_etag, task_etag
+from stats_service import (STATS_SUMMARY_KEY, DEFAULT_BREAKDOWN_SIZE, MAX_BREAKDOWN_SIZE, summary_stats,
+                           stat_breakdowns_select, build_stats_breakdowns, track_task_stats)
+from change_feed import (RECONNECT_DELAY_MS, notifier, track_task_changes, parse_last_event_id, latest_change_seq_select,
+                         task_changes_select, event_tasks_select, build_task_events, format_event)
+from sqlite_tuning import install_sqlite_pragmas
+
+logger = logging.getLogger(__name__)
+
+# 任务接口允许访问的角色（与 role_required('data_entry', 'supervisor') 一致）
+TASK_ROLES = ('data_entry', 'supervisor')
+# 分组统计（含创建者姓名和负责人）允许访问的角色（与 role_required('admin', 'supervisor') 一致）
+STATS_BREAKDOWN_ROLES = ('admin', 'supervisor')
+
+class AsyncApiSession(Session):
+    """异步会话内部使用的同步会话类，单独注册统计表维护和变更通知事件"""
+
+track_task_stats(AsyncApiSession)
+track_task_changes(AsyncApiSession)
+
+class ApiError(Exception):
+    """处理请求时需要返回的JSON错误响应"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class AsyncRequest:
+    """ASGI请求的简单封装：方法、查询参数（与 request.args 相同的MultiDict）、请求头和请求体"""
+
+    def __init__(self, scope, receive):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.raw_headers = [(name.decode('latin-1'), value.decode('latin-1')) for name, value in scope['headers']]
+        self.client = scope['client'][0] if scope.get('client') else None
+        self.args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1'), keep_blank_values=True))
+        self.headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+        self._receive = receive
+
+    async def body(self):
+        """读取完整的请求体"""
+        chunks = []
+        while True:
+            message = await self._receive()
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                return b''.join(chunks)
+
+    async def wait_disconnect(self):
+        """等待客户端断开连接（事件流使用，请求体已读完）"""
+        while (await self._receive())['type'] != 'http.disconnect':
+            pass
+
+    async def get_json(self):
+        """解析JSON请求体，格式不合法时返回400"""
+        try:
+            return json.loads(await self.body() or b'null')
+        except ValueError:
+            raise ApiError(400, '请求体不是合法的JSON')
+
+    def none_match(self, etag):
+        """If-None-Match 与ETag弱比较相同（客户端缓存仍然有效）"""
+        return parse_etags(self.headers.get('if-none-match')).contains_weak(etag)
+
+    def if_match_failed(self, etag):
+        """请求带有 If-Match 且与当前ETag不匹配（强比较）"""
+        if_match = self.headers.get('if-match')
+        return bool(if_match) and not parse_etags(if_match).contains(etag)
+
+def etag_headers(etag, weak=False):
+    """ETag响应头，与 set_etag 相同：要求浏览器每次使用缓存前先向服务器验证"""
+    return [('etag', quote_etag(etag, weak)), ('cache-control', 'private, no-cache')]
+
+class AsyncTaskAPI:
+    """
+    异步任务API（ASGI应用）
+    参数:
+        flask_app - Flask应用，提供数据库地址、连接池配置、会话密钥和JSON编码
+        fallback - 未匹配请求交给的ASGI应用（通常是包装后的Flask应用），为None时返回404
+    登录状态按Flask-Login的规则从会话Cookie和"记住我"Cookie中识别；读请求不使用只读副本
+    """
+
+    def __init__(self, flask_app, fallback=None):
+        self.flask_app = flask_app
+        self.fallback = fallback
+        self.json = flask_app.json
+
+        with flask_app.app_context():
+            url = db.engine.url
+        if url.get_backend_name() != 'sqlite':
+            raise RuntimeError('异步任务API目前只支持SQLite数据库（aiosqlite）')
+        self.engine = create_async_engine(
+            url.set(drivername='sqlite+aiosqlite'), **flask_app.config['SQLALCHEMY_ENGINE_OPTIONS']
+        )
+        install_sqlite_pragmas(self.engine.sync_engine, flask_app.config)
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False, sync_session_class=AsyncApiSession)
+
+        self.routes = [
+            ('GET', re.compile(r'/api/tasks'), self.list_tasks),
+            ('POST', re.compile(r'/api/tasks'), self.create_task),
+            ('GET', re.compile(r'/api/tasks/(?P<task_id>\d+)'), self.get_task),
+            ('PUT', re.compile(r'/api/tasks/(?P<task_id>\d+)'), self.update_task),
+            ('PUT', re.compile(r'/api/tasks/(?P<task_id>\d+)/progress'), self.update_progress),
+            ('GET', re.compile(r'/api/stats'), self.get_stats),
+            ('GET', re.compile(r'/api/stats/breakdowns'), self.get_stats_breakdowns),
+        ]
+        # 流式响应的接口：处理函数自行发送响应
+        self.stream_routes = [
+            ('GET', re.compile(r'/api/tasks/stream'), self.task_stream),
+        ]
+
+    # ========== ASGI入口 ==========
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+
+        if scope['type'] == 'http':
+            handler, params = self._match(scope, self.stream_routes)
+            if handler is not None:
+                return await handler(AsyncRequest(scope, receive), send)
+
+        handler, params = self._match(scope, self.routes) if scope['type'] == 'http' else (None, None)
+        if handler is None:
+            if self.fallback is not None:
+                return await self.fallback(scope, receive, send)
+            return await self._send_json(send, 404, {'error': 'Resource not found'})
+
+        request = AsyncRequest(scope, receive)
+        try:
+            async with self.sessionmaker() as session:
+                status, data, headers = await handler(session, request, **params)
+        except ApiError as e:
+            status, data, headers = e.status, {'error': e.message}, None
+        except Exception:
+            logger.exception('异步接口处理请求失败: %s %s', request.method, request.path)
+            status, data, headers = 500, {'error': 'Internal server error'}, None
+        await self._send_json(send, status, data, headers)
+
+    def _match(self, scope, routes):
+        """按方法和路径查找处理函数，返回 (处理函数, 路径参数)"""
+        for method, pattern, handler in routes:
+            if scope['method'] == method:
+                match = pattern.fullmatch(scope['path'])
+                if match:
+                    return handler, {name: int(value) for name, value in match.groupdict().items()}
+        return None, None
+
+    async def _lifespan(self, receive, send):
+        """应用关闭时释放连接池"""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _send_json(self, send, status, data, headers=None):
+        """发送JSON响应（304响应没有响应体），编码方式与Flask的JSON提供者相同"""
+        body = b'' if status == 304 else self.json.dumps(data).encode('utf-8') + b'\n'
+        response_headers = [(b'content-length', str(len(body)).encode('latin-1'))]
+        if status != 304:
+            response_headers.append((b'content-type', b'application/json'))
+        for name, value in headers or ():
+            response_headers.append((name.encode('latin-1'), value.encode('latin-1')))
+        await send({'type': 'http.response.start', 'status': status, 'headers': response_headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    # ========== 登录和权限 ==========
+
+    def _login_user_id(self, request):
+        """
+        按Flask-Login的规则（LoginManager._load_user）取出登录用户ID，不访问数据库：
+        在Flask请求上下文中由Flask的会话接口解码会话，先做会话保护检查（SESSION_PROTECTION），
+        会话中没有登录用户时使用"记住我"Cookie（登出后 _remember=clear 时不再使用）
+        同步视图通过"记住我"Cookie登录后会重写会话Cookie，异步接口不写回，下次请求仍从该Cookie识别
+        """
+        environ = EnvironBuilder(path=request.path, method=request.method, headers=request.raw_headers,
+                                 environ_base={'REMOTE_ADDR': request.client}).get_environ()
+        with self.flask_app.request_context(environ):
+            if self.flask_app.login_manager._session_protection_failed():
+                return None
+            user_id = flask_session.get('_user_id')
+            cookie_name = self.flask_app.config.get('REMEMBER_COOKIE_NAME', COOKIE_NAME)
+            if user_id is None and cookie_name in flask_request.cookies and flask_session.get('_remember') != 'clear':
+                user_id = decode_cookie(flask_request.cookies[cookie_name])
+        return user_id
+
+    async def _current_user(self, session, request):
+        """识别登录用户并加载（与 user_loader 共用登录用户缓存）"""
+        user_id = self._login_user_id(request)
+        if user_id is None:
+            return None
+        user_id = int(user_id)
+        if users_version_check_due():
+            observe_users_version((await session.execute(users_version_select())).one())
+        version = user_cache_version(user_id)
+        user = get_cached_user(version)
+        if user is MISSING:
+            user = cache_user(version, await session.get(User, user_id))
+        return user
+
+    async def _require_task_user(self, session, request):
+        """任务接口的登录和角色检查，规则与 role_required('data_entry', 'supervisor') 相同"""
+        return await self._require_role(session, request, TASK_ROLES)
+
+    async def _require_role(self, session, request, roles):
+        """登录和角色检查，规则与 role_required(*roles) 相同"""
+        user = await self._current_user(session, request)
+        if user is None:
+            raise ApiError(401, '请先登录才能访问此页面。')
+        if user.role not in roles:
+            raise ApiError(403, '您没有权限访问此页面')
+        if not user.is_active:
+            raise ApiError(403, '您的账户已被禁用，请联系管理员')
+        return user
+
+    # ========== 数据读取 ==========
+
+    async def _collection_etag(self, session, name):
+        """读取数据版本并生成集合接口的ETag"""
+        row = (await session.execute(collection_version_select())).one()
+        return collection_etag(name, collection_version(row))
+
+    async def _load_task_row(self, session, task_id, fields=TASK_FIELDS):
+        """按ID读取任务的列数据（附带ETag所需的id和更新时间），不存在时返回404"""
+        stmt = task_rows_select(fields, extra_fields=('id', 'updated_at')).where(Task.id == task_id)
+        row = (await session.execute(stmt)).first()
+        if row is None:
+            raise ApiError(404, 'Resource not found')
+        return row
+
+    async def _load_task_for_update(self, session, task_id):
+        """读取待修改的任务（同时加载创建者，权限提示中需要创建者姓名），不存在时返回404"""
+        stmt = select(Task).options(joinedload(Task.creator)).where(Task.id == task_id)
+        task = (await session.execute(stmt)).scalars().first()
+        if task is None:
+            raise ApiError(404, 'Resource not found')
+        return task
+
+    async def _prime_category_cache(self, session, category, category_id):
+        """
+        Task.create_task 校验分类时读取分类缓存，未命中才同步查询数据库；
+        这里先异步读取将要用到的启用分类写入缓存，校验时不再阻塞事件循环
+        """
+        if category_id:
+            key = ('id', category_id)
+        else:
+            key = ('name', category or 'general')
+        if category_cache.get(key) is not MISSING:
+            return
+        column = TaskCategory.id if key[0] == 'id' else TaskCategory.name
+        stmt = select(TaskCategory).where(TaskCategory.is_active == True, column == key[1])  # noqa: E712
+        found = (await session.execute(stmt)).scalars().first()
+        category_cache.set(key, CategoryInfo(found.id, found.name, found.display_name, found.color) if found else None)
+
+    async def _commit(self, session, error_message):
+        """提交事务，失败时回滚并返回500"""
+        try:
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            logger.exception(error_message)
+            raise ApiError(500, error_message)
+
+    # ========== 接口 ==========
+
+    async def list_tasks(self, session, request):
+        """分页获取任务（与 GET /api/tasks 相同：游标分页、筛选、排序、字段选择和首页分面计数）"""
+        await self._require_task_user(session, request)
+        etag = await self._collection_etag(session, 'tasks')
+        if request.none_match(etag):
+            return 304, None, etag_headers(etag, weak=True)
+
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            filters = parse_task_filters(request.args)
+            sort = parse_sort(request.args.get('sort'), SORT_FIELDS)
+            cursor = request.args.get('cursor')
+            fields = parse_fields(request.args.get('fields'))
+            stmt = apply_task_filters(task_rows_select(fields, extra_fields=(sort.lstrip('-'), 'id')), filters)
+            stmt = keyset_window(stmt, Task, limit, cursor, sort)
+        except ValueError as e:
+            raise ApiError(400, str(e))
+
+        rows, next_cursor = keyset_page((await session.execute(stmt)).all(), limit, sort)
+        tasks = [row_to_dict(row, fields) for row in rows]
+        result = {
+            'tasks': tasks,
+            'count': len(tasks),
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
+        }
+        if parse_facets_flag(request.args):
+            if uses_stat_facets(filters):
+                facet_rows = stat_facet_rows((await session.execute(stat_facets_select())).all())
+            else:
+                facet_rows = (await session.execute(task_facets_select(filters))).all()
+            result['facets'] = summarize_task_facets(facet_rows, filters)
+        return 200, result, etag_headers(etag, weak=True)
+
+    async def get_task(self, session, request, task_id):
+        """获取单个任务（支持 fields 参数和 If-None-Match）"""
+        await self._require_task_user(session, request)
+        try:
+            fields = parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            raise ApiError(400, str(e))
+
+        row = await self._load_task_row(session, task_id, fields)
+        etag = task_etag(row)
+        if request.none_match(etag):
+            return 304, None, etag_headers(etag)
+        return 200, {'task': row_to_dict(row, fields)}, etag_headers(etag)
+
+    async def create_task(self, session, request):
+        """创建任务，数据校验由 Task.create_task 完成"""
+        user = await self._require_task_user(session, request)
+        data = await request.get_json()
+        if not data:
+            raise ApiError(400, '没有提供数据')
+
+        await self._prime_category_cache(session, data.get('category'), data.get('category_id'))
+        try:
+            # 分类缓存被其他线程清空时，校验会退回到同步查询，因此在应用上下文中执行
+            with self.flask_app.app_context():
+                task = Task.create_task(
+                    title=data.get('title'),
+                    description=data.get('description'),
+                    status=data.get('status', 'pending'),
+                    progress=data.get('progress', 0),
+                    planned_start_date=data.get('planned_start_date'),
+                    planned_end_date=data.get('planned_end_date'),
+                    assignee=data.get('assignee'),
+                    category=data.get('category'),
+                    category_id=data.get('category_id'),
+                    creator_id=user.id  # 设置当前用户为创建者
+                )
+        except ValueError as e:
+            raise ApiError(400, str(e))
+
+        session.add(task)
+        await self._commit(session, '创建任务时发生错误')
+        row = await self._load_task_row(session, task.id)
+        return 201, {'task': row_to_dict(row)}, None
+
+    async def update_task(self, session, request, task_id):
+        """更新任务（支持 If-Match 乐观并发控制），数据校验由 Task.update_task 完成"""
+        user = await self._require_task_user(session, request)
+        task = await self._load_task_for_update(session, task_id)
+        if not check_task_edit_permission(task, user):
+            raise ApiError(403, get_permission_denied_message(task, '修改', user))
+        if request.if_match_failed(task_etag(task)):
+            raise ApiError(412, '任务已被其他用户修改，请刷新后重试')
+
+        data = await request.get_json()
+        if not data:
+            raise ApiError(400, 'No data provided')
+
+        update_fields = {field: data[field] for field in ['title', 'description', 'status', 'progress'] if field in data}
+        if update_fields:
+            try:
+                task.update_task(**update_fields)
+            except ValueError as e:
+                raise ApiError(400, str(e))
+            await self._commit(session, 'An error occurred while updating the task')
+
+        row = await self._load_task_row(session, task_id)
+        return 200, {'task': row_to_dict(row)}, etag_headers(task_etag(row))
+
+    async def update_progress(self, session, request, task_id):
+        """更新任务进度，并根据进度自动更新状态"""
+        user = await self._require_task_user(session, request)
+        task = await self._load_task_for_update(session, task_id)
+        if not check_task_edit_permission(task, user):
+            raise ApiError(403, get_permission_denied_message(task, '修改', user))
+
+        data = await request.get_json()
+        if not data or 'progress' not in data:
+            raise ApiError(400, '进度值是必需的')
+
+        progress = data['progress']
+        if self.flask_app.config['PROGRESS_WRITE_MODE'] == 'buffered':
+            # 写入缓冲模式：与 PUT /api/tasks/<id>/progress 相同，进入缓冲后立即返回
+            try:
+                validate_progress(progress)
+            except ValueError as e:
+                raise ApiError(400, str(e))
+            progress_buffer.submit(task_id, progress)
+            return 202, accepted_progress(task_id, progress, task.status), None
+
+        try:
+            task.update_task(progress=progress)
+        except ValueError as e:
+            raise ApiError(400, str(e))
+        task.status = status_for_progress(progress, task.status)
+        await self._commit(session, '更新进度时发生错误')
+
+        row = await self._load_task_row(session, task_id)
+        return 200, {'task': row_to_dict(row)}, None
+
+    async def get_stats(self, session, request):
+        """任务统计（只读取统计表的全部任务汇总行，与 GET /api/stats 相同）"""
+        etag = await self._collection_etag(session, 'stats')
+        if request.none_match(etag):
+            return 304, None, etag_headers(etag, weak=True)
+
+        stats = summary_stats(await session.get(TaskStat, STATS_SUMMARY_KEY))
+        return 200, stats, etag_headers(etag, weak=True)
+
+    async def get_stats_breakdowns(self, session, request):
+        """分组统计（与 GET /api/stats/breakdowns 相同）"""
+        await self._require_role(session, request, STATS_BREAKDOWN_ROLES)
+        try:
+            limit = parse_limit(request.args.get('limit'), DEFAULT_BREAKDOWN_SIZE, MAX_BREAKDOWN_SIZE)
+        except ValueError as e:
+            raise ApiError(400, str(e))
+
+        etag = await self._collection_etag(session, f'stats-breakdowns:{limit}')
+        if request.none_match(etag):
+            return 304, None, etag_headers(etag, weak=True)
+
+        rows = (await session.execute(stat_breakdowns_select(limit))).all()
+        return 200, build_stats_breakdowns(rows), etag_headers(etag, weak=True)
+
+    # ========== 事件流 ==========
+
+    async def task_stream(self, request, send):
+        """
+        任务变更事件流（与 GET /api/tasks/stream 相同的事件格式和断线续传）
+        等待变更时不占用线程和数据库连接：本进程的提交通过通知器回调唤醒，其他进程的写入按间隔检查
+        """
+        async with self.sessionmaker() as session:
+            try:
+                await self._require_task_user(session, request)
+                try:
+                    last_seq = parse_last_event_id(request.headers.get('last-event-id', request.args.get('last_event_id')))
+                except ValueError as e:
+                    raise ApiError(400, str(e))
+                if last_seq is None:
+                    # 新连接只推送此后的变更
+                    last_seq = (await session.execute(latest_change_seq_select())).scalar() or 0
+                    notifier.observe(last_seq)
+            except ApiError as e:
+                return await self._send_json(send, e.status, {'error': e.message})
+
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ]})
+        async with aclosing(self._task_events(request, last_seq)) as chunks:
+            async for chunk in chunks:
+                await send({'type': 'http.response.body', 'body': chunk.encode('utf-8'), 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def _task_events(self, request, last_seq):
+        """生成事件流内容，逻辑与 change_feed.stream_task_events 相同；客户端断开或到达最长持续时间时结束"""
+        config = self.flask_app.config
+        poll_interval = config['TASK_STREAM_POLL_SECONDS']
+        heartbeat_interval = config['TASK_STREAM_HEARTBEAT_SECONDS']
+        batch_size = config['TASK_STREAM_BATCH_SIZE']
+        deadline = time.monotonic() + config['TASK_STREAM_MAX_SECONDS']
+        last_sent = time.monotonic()
+
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+
+        def listener():
+            # 提交可能发生在其他线程（同步视图），通过事件循环设置
+            loop.call_soon_threadsafe(wake.set)
+
+        notifier.subscribe(listener)
+        disconnected = asyncio.ensure_future(request.wait_disconnect())
+        try:
+            yield f'retry: {RECONNECT_DELAY_MS}\n\n'
+            has_new = True  # 连接建立时先补发 last_seq 之后的变更
+            while not disconnected.done() and time.monotonic() < deadline:
+                if has_new:
+                    # 先清除唤醒标记再读取，读取期间的提交会再次唤醒
+                    wake.clear()
+                    events = await self._load_task_events(last_seq, batch_size)
+                    for task_event in events:
+                        yield format_event(task_event)
+                    if events:
+                        last_seq = events[-1]['seq']
+                        notifier.observe(last_seq)
+                        last_sent = time.monotonic()
+                    # 读满一批说明可能还有未发送的变更
+                    has_new = len(events) == batch_size
+                    if has_new:
+                        continue
+
+                waiter = asyncio.ensure_future(wake.wait())
+                await asyncio.wait({waiter, disconnected}, timeout=poll_interval, return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+                if wake.is_set():
+                    has_new = True
+                    continue
+
+                if notifier.poll_due(poll_interval):
+                    async with self.sessionmaker() as session:
+                        seq = (await session.execute(latest_change_seq_select())).scalar() or 0
+                    notifier.publish_if_newer(seq)
+                if time.monotonic() - last_sent >= heartbeat_interval:
+                    yield ': keepalive\n\n'
+                    last_sent = time.monotonic()
+        finally:
+            notifier.unsubscribe(listener)
+            disconnected.cancel()
+
+    async def _load_task_events(self, last_seq, batch_size):
+        """读取 last_seq 之后的变更和任务当前数据，读取后立即归还连接"""
+        async with self.sessionmaker() as session:
+            changes = (await session.execute(task_changes_select(last_seq, batch_size))).scalars().all()
+            stmt = event_tasks_select(changes)
+            tasks = {task.id: task for task in (await session.execute(stmt)).scalars()} if stmt is not None else {}
+            return build_task_events(changes, tasks)
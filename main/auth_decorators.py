@@ -126,25 +126,26 @@ def task_permission_required(permission_type):
         return decorated_function
     return decorator
 
-def check_task_edit_permission(task):
+def check_task_edit_permission(task, user=None):
     """
     检查用户是否有权限编辑特定任务
-    参数: task - 任务对象
+    参数: task - 任务对象, user - 用户（默认为当前登录用户，异步接口显式传入）
     返回: True/False
     """
-    if not current_user.is_authenticated or not current_user.is_active:
+    user = current_user if user is None else user
+    if not user.is_authenticated or not user.is_active:
         return False
     
     # 管理员不能编辑任务
-    if current_user.role == 'admin':
+    if user.role == 'admin':
         return False
     
     # 录入员只能编辑自己创建的任务
-    if current_user.role == 'data_entry':
-        return task.creator_id == current_user.id
+    if user.role == 'data_entry':
+        return task.creator_id == user.id
     
     # 监督员可以编辑所有任务
-    if current_user.role == 'supervisor':
+    if user.role == 'supervisor':
         return True
     
     return False
@@ -191,17 +192,19 @@ def check_task_delete_permission(task):
     
     return False
 
-def get_permission_denied_message(task, operation='编辑'):
+def get_permission_denied_message(task, operation='编辑', user=None):
     """
     生成权限被拒绝时的详细提示信息
     参数: 
         task - 任务对象
         operation - 操作类型 ('编辑', '删除', '修改')
+        user - 用户（默认为当前登录用户）
     返回: 错误信息字符串
     """
-    if current_user.role == 'data_entry':
+    user = current_user if user is None else user
+    if user.role == 'data_entry':
         creator_name = task.get_creator_display()
-        if task.creator_id and task.creator_id != current_user.id:
+        if task.creator_id and task.creator_id != user.id:
             return f'您没有权限{operation}此任务。此任务由 {creator_name} 创建，录入员只能{operation}自己创建的任务。'
         else:
             return f'您没有权限{operation}此任务'
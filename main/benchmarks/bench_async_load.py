@@ -0,0 +1,166 @@
+# 高并发负载测试：大量并发连接持续请求任务接口，对比同步WSGI服务（wsgi.py）与异步ASGI服务（asgi.py + uvicorn）的每秒请求数
+# 负载由标准库asyncio实现的HTTP/1.1长连接客户端产生：读请求 GET /api/tasks，按比例混入 PUT /api/tasks/<id>/progress
+# 异步服务需要安装 requirements-async.txt 中的依赖，未安装时跳过
+# 用法: python benchmarks/bench_async_load.py [并发连接数] [每轮秒数] [写请求比例]
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+# 必须在导入应用之前指定临时数据库（服务进程通过环境变量使用同一个数据库）
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'async_load.db')
+
+from bench_utils import seed_tasks
+from app import app
+from db_setup import init_database
+from models import User
+
+MAIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOST = '127.0.0.1'
+PORT = 8765
+READ_PATH = '/api/tasks?limit=20&fields=id,title,status,progress'
+
+SERVERS = [
+    ('同步 WSGI（wsgi.py）', [sys.executable, 'wsgi.py'], ()),
+    ('异步 ASGI（asgi.py + uvicorn）',
+     [sys.executable, '-m', 'uvicorn', 'asgi:application', '--host', HOST, '--port', str(PORT),
+      '--log-level', 'warning', '--no-access-log', '--backlog', '4096'],
+     ('aiosqlite', 'greenlet', 'asgiref', 'uvicorn')),
+]
+
+def session_cookie(user_id):
+    """生成与Flask-Login登录后相同的会话Cookie"""
+    serializer = app.session_interface.get_signing_serializer(app)
+    value = serializer.dumps({'_user_id': str(user_id), '_fresh': True})
+    return f'{app.config["SESSION_COOKIE_NAME"]}={value}'
+
+def start_server(command):
+    """启动服务进程并等待端口可以连接"""
+    env = dict(os.environ, HOST=HOST, PORT=str(PORT), THREADS='32')
+    process = subprocess.Popen(command, cwd=MAIN_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection((HOST, PORT), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError('服务进程启动超时')
+
+async def read_response(reader):
+    """读取一个HTTP响应，返回 (状态码, 连接是否可以复用)"""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    version, status = lines[0].split(' ', 2)[:2]
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.read()
+        return int(status), False
+
+    keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+    return int(status), keep_alive
+
+def build_request(method, path, cookie, body=b''):
+    """构造HTTP/1.1请求报文"""
+    lines = [f'{method} {path} HTTP/1.1', f'Host: {HOST}:{PORT}', f'Cookie: {cookie}']
+    if body:
+        lines += ['Content-Type: application/json', f'Content-Length: {len(body)}']
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+async def client(cookie, task_ids, write_ratio, deadline, seed, results):
+    """单个长连接客户端：在截止时间前不断发送请求，记录每个请求的耗时和结果"""
+    rng = random.Random(seed)
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(HOST, PORT)
+            if rng.random() < write_ratio:
+                body = json.dumps({'progress': rng.randint(1, 100)}).encode('utf-8')
+                request = build_request('PUT', f'/api/tasks/{rng.choice(task_ids)}/progress', cookie, body)
+            else:
+                request = build_request('GET', READ_PATH, cookie)
+            started = time.perf_counter()
+            writer.write(request)
+            status, keep_alive = await read_response(reader)
+            results['latencies'].append(time.perf_counter() - started)
+            results['ok' if status == 200 else 'failed'] += 1
+            if not keep_alive:
+                writer.close()
+                writer = None
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            results['failed'] += 1
+            if writer is not None:
+                writer.close()
+            writer = None
+            await asyncio.sleep(0.05)
+    if writer is not None:
+        writer.close()
+
+async def run_load(connections, duration, write_ratio, cookie, task_ids):
+    """同时运行多个客户端，返回统计结果"""
+    results = {'ok': 0, 'failed': 0, 'latencies': []}
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(client(cookie, task_ids, write_ratio, deadline, seed, results)
+                           for seed in range(connections)))
+    return results
+
+def percentile(values, fraction):
+    """返回有序列表的分位数"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def main(connections, duration, write_ratio):
+    with app.app_context():
+        init_database()
+    seed_tasks(app, 10000)
+    with app.app_context():
+        user_id = User.query.filter_by(username='bench').first().id
+    cookie = session_cookie(user_id)
+    task_ids = list(range(1, 10001))
+
+    print(f'并发连接={connections} 每轮={duration}秒 写请求比例={write_ratio}')
+    print(f'{"服务":<28} {"请求/秒":>10} {"成功":>8} {"失败":>6} {"p50(ms)":>9} {"p99(ms)":>9}')
+    for name, command, modules in SERVERS:
+        missing = [module for module in modules if importlib.util.find_spec(module) is None]
+        if missing:
+            print(f'{name:<24} 跳过（未安装: {", ".join(missing)}）')
+            continue
+        process = start_server(command)
+        try:
+            asyncio.run(run_load(min(connections, 20), 1, write_ratio, cookie, task_ids))  # 预热连接池和模板
+            results = asyncio.run(run_load(connections, duration, write_ratio, cookie, task_ids))
+        finally:
+            process.terminate()
+            process.wait()
+        latencies = sorted(results['latencies'])
+        print(f'{name:<24} {results["ok"] / duration:>10.1f} {results["ok"]:>8} {results["failed"]:>6} '
+              f'{percentile(latencies, 0.5) * 1000:>9.1f} {percentile(latencies, 0.99) * 1000:>9.1f}')
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 500,
+         int(args[1]) if len(args) > 1 else 10,
+         float(args[2]) if len(args) > 2 else 0.1)
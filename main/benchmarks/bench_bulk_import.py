@@ -0,0 +1,58 @@
+# 批量导入基准测试：对比逐条创建提交与分批批量插入的吞吐量（行/秒）
+# 用法: python benchmarks/bench_bulk_import.py [导入行数]
+import io
+import json
+import sys
+import time
+
+from bench_utils import make_app
+from models import db, Task
+from bulk_import import iter_ndjson, import_tasks
+
+def make_ndjson(count):
+    """生成指定行数的NDJSON文本"""
+    lines = []
+    for i in range(count):
+        lines.append(json.dumps({
+            'title': f'导入任务 {i}',
+            'description': '批量导入的任务描述',
+            'status': 'in-progress',
+            'progress': i % 100,
+            'assignee': '张三',
+            'planned_start_date': '2024-01-01',
+            'planned_end_date': '2024-02-01'
+        }, ensure_ascii=False))
+    return '\n'.join(lines)
+
+def import_one_by_one(payload):
+    """旧方式：每行一次 create_task + commit（等同于逐条调用 POST /api/tasks）"""
+    for _, record, _ in iter_ndjson(io.StringIO(payload)):
+        task = Task.create_task(title=record['title'], description=record['description'],
+                                status=record['status'], progress=record['progress'],
+                                assignee=record['assignee'], creator_id=None)
+        db.session.add(task)
+        db.session.commit()
+
+def import_in_chunks(payload, chunk_size):
+    """新方式：流式解析 + 分批批量插入"""
+    result = import_tasks(iter_ndjson(io.StringIO(payload)), None, chunk_size)
+    assert result['failed'] == 0, result['errors'][:3]
+
+def run(label, count, func, *args):
+    app = make_app()
+    payload = make_ndjson(count)
+    with app.app_context():
+        started = time.perf_counter()
+        func(payload, *args)
+        elapsed = time.perf_counter() - started
+        assert Task.query.count() == count
+    print(f'{label:<20} {count:>8} 行  {elapsed:>8.2f} 秒  {count / elapsed:>10.0f} 行/秒')
+
+def main(count):
+    # 逐条提交非常慢，只用较少的行数测量
+    run('逐条提交', min(count, 2000), import_one_by_one)
+    for chunk_size in (100, 1000, 5000):
+        run(f'批量插入 chunk={chunk_size}', count, import_in_chunks, chunk_size)
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,49 @@
+# 登录吞吐量基准测试：N个并发用户同时登录时，直接哈希与有界线程池哈希的吞吐量和延迟
+# 用法: python benchmarks/bench_login.py [并发用户数] [哈希方法]
+import statistics
+import sys
+import threading
+import time
+
+import bench_utils  # noqa: F401  设置导入路径
+from werkzeug.security import generate_password_hash, check_password_hash
+from password_hashing import PasswordHasher
+
+def run(label, concurrency, verify, password_hash):
+    """启动concurrency个线程同时校验密码，返回吞吐量和延迟分布"""
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(concurrency)
+
+    def login():
+        barrier.wait()
+        started = time.perf_counter()
+        assert verify(password_hash, '123456')
+        with lock:
+            latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=login) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f'{label:<22} {concurrency / elapsed:>8.1f} 次/秒  '
+          f'p50={statistics.median(latencies) * 1000:>7.0f}ms  p95={p95 * 1000:>7.0f}ms')
+
+def main(concurrency, method):
+    password_hash = generate_password_hash('123456', method)
+    print(f'并发用户数={concurrency} 哈希方法={method}')
+    run('直接调用（无界）', concurrency, check_password_hash, password_hash)
+    for workers in (2, 4, 8):
+        hasher = PasswordHasher(method, workers=workers, max_pending=concurrency)
+        run(f'线程池 workers={workers}', concurrency, hasher.verify, password_hash)
+        hasher.shutdown()
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 64,
+         sys.argv[2] if len(sys.argv) > 2 else 'pbkdf2:sha256:600000')
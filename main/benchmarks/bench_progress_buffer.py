@@ -0,0 +1,97 @@
+# 进度写入缓冲负载测试：模拟多个客户端拖动进度滑块（少量热点任务被高频更新），同时测量 GET /api/tasks 的吞吐量
+# 对比每次更新立即提交（immediate）与写入缓冲合并提交（buffered），统计写请求吞吐量和实际提交次数
+# 用法: python benchmarks/bench_progress_buffer.py [读线程数] [写线程数] [每轮秒数] [热点任务数]
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+# 必须在导入应用之前指定临时数据库
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'progress_buffer.db')
+
+from sqlalchemy import event
+from bench_utils import seed_tasks
+from app import app
+from db_setup import init_database
+from models import db, User
+from progress_buffer import progress_buffer, init_progress_buffer
+
+MODES = ['immediate', 'buffered']
+
+def make_client(user_id):
+    """创建已登录的测试客户端"""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return client
+
+def run_mode(readers, writers, duration, user_id, task_ids):
+    """运行一轮负载，返回 (读次数, 写次数, 错误次数)"""
+    counts = {'read': 0, 'write': 0, 'error': 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def reader():
+        client = make_client(user_id)
+        while not stop.is_set():
+            ok = client.get('/api/tasks?limit=50').status_code == 200
+            with lock:
+                counts['read' if ok else 'error'] += 1
+
+    def writer():
+        client = make_client(user_id)
+        rng = random.Random()
+        task_id, progress = rng.choice(task_ids), 0
+        while not stop.is_set():
+            # 滑块拖动：同一任务连续上报逐步变化的进度，拖到头后换一个任务
+            progress += rng.randint(1, 5)
+            if progress > 99:
+                task_id, progress = rng.choice(task_ids), 1
+            response = client.put(f'/api/tasks/{task_id}/progress', json={'progress': progress})
+            with lock:
+                counts['write' if response.status_code in (200, 202) else 'error'] += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    progress_buffer.flush()
+    return counts['read'], counts['write'], counts['error']
+
+def main(readers, writers, duration, hot_tasks):
+    with app.app_context():
+        init_database(with_samples=True)
+    seed_tasks(app, 10000)
+    with app.app_context():
+        user_id = User.query.filter_by(username='supervisor1').first().id
+        task_ids = [row[0] for row in db.session.execute(db.text('SELECT id FROM tasks LIMIT :n'), {'n': hot_tasks})]
+        engine = db.engine
+
+    commits = [0]
+
+    def on_commit(conn):
+        commits[0] += 1
+
+    event.listen(engine, 'commit', on_commit)
+
+    print(f'读线程={readers} 写线程={writers} 每轮{duration}秒 热点任务={hot_tasks} '
+          f'写入窗口={app.config["PROGRESS_FLUSH_SECONDS"]}秒')
+    for mode in MODES:
+        app.config['PROGRESS_WRITE_MODE'] = mode
+        init_progress_buffer(app)
+        commits[0] = 0
+        reads, writes, errors = run_mode(readers, writers, duration, user_id, task_ids)
+        print(f'{mode:<10} 读 {reads / duration:>8.1f} 次/秒  写 {writes / duration:>8.1f} 次/秒  '
+              f'提交 {commits[0]:>6}  错误 {errors}')
+    print('缓冲统计:', progress_buffer.metrics())
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [4, 4, 5, 20][len(args):]))
@@ -0,0 +1,61 @@
+# 任务列表页面渲染基准测试：对比片段缓存为空、全部命中、少量任务更新后的 /tasks 页面耗时
+# 用法: python benchmarks/bench_render.py [任务数] [重复次数] [更新任务数]
+import os
+import random
+import sys
+import tempfile
+import time
+
+# 必须在导入应用之前指定临时数据库
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'render.db')
+
+from bench_utils import seed_tasks
+from app import app
+from db_setup import init_database
+from models import User
+from fragment_cache import fragment_cache
+
+def make_client(user_id):
+    """创建已登录的测试客户端"""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return client
+
+def timed_get(client, url):
+    """请求页面，返回耗时（秒）"""
+    started = time.perf_counter()
+    response = client.get(url)
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200, response.status_code
+    return elapsed
+
+def main(count, repeat, updates):
+    with app.app_context():
+        init_database()
+    seed_tasks(app, count)
+    with app.app_context():
+        user_id = User.query.filter_by(username='bench').first().id
+    client = make_client(user_id)
+    rng = random.Random(1)
+
+    cold, warm, partial = [], [], []
+    for _ in range(repeat):
+        fragment_cache.clear()
+        cold.append(timed_get(client, '/tasks'))
+        warm.append(timed_get(client, '/tasks'))
+        # 更新少量任务后再次渲染：只有这些任务的片段需要重新渲染
+        for task_id in rng.sample(range(1, count + 1), updates):
+            client.put(f'/api/tasks/{task_id}/progress', json={'progress': rng.randint(1, 99)})
+        partial.append(timed_get(client, '/tasks'))
+
+    print(f'任务数={count} 重复={repeat}（取最短耗时）')
+    print(f'{"场景":<24} {"耗时(ms)":>10}')
+    print(f'{"缓存为空（全部渲染）":<20} {min(cold) * 1000:>10.1f}')
+    print(f'{"全部命中":<22} {min(warm) * 1000:>10.1f}')
+    print(f'{f"更新{updates}个任务后":<20} {min(partial) * 1000:>10.1f}')
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(args[0] if args else 2000, args[1] if len(args) > 1 else 5, args[2] if len(args) > 2 else 20)
@@ -0,0 +1,55 @@
+# 任务列表序列化基准测试：对比ORM对象+to_dict、列式查询、列式查询+orjson 生成JSON响应的耗时
+# 用法: python benchmarks/bench_serialize.py [任务数] [重复次数]
+import json
+import sys
+import time
+
+from bench_utils import make_app, seed_tasks
+from models import Task
+from task_serialization import task_rows_query, row_to_dict
+import json_provider
+
+def orm_to_dict():
+    """旧实现：加载ORM对象（预加载创建者）后逐个调用 to_dict，标准库编码"""
+    tasks = Task.query_with_relations().order_by(Task.created_at.desc(), Task.id.desc()).all()
+    return json.dumps({'tasks': [task.to_dict() for task in tasks]}, ensure_ascii=True, sort_keys=True).encode('utf-8')
+
+def columnar_stdlib():
+    """列式查询，标准库编码"""
+    rows = task_rows_query().order_by(Task.created_at.desc(), Task.id.desc()).all()
+    return json.dumps({'tasks': [row_to_dict(row) for row in rows]}, ensure_ascii=True, sort_keys=True).encode('utf-8')
+
+def columnar_orjson():
+    """列式查询，orjson编码"""
+    rows = task_rows_query().order_by(Task.created_at.desc(), Task.id.desc()).all()
+    return json_provider.orjson.dumps({'tasks': [row_to_dict(row) for row in rows]})
+
+def measure(func, repeat):
+    """执行repeat次，返回最短耗时和输出字节数"""
+    best, size = None, 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(func())
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, size
+
+def main(count, repeat):
+    app = make_app()
+    seed_tasks(app, count)
+    cases = [('ORM+to_dict+json', orm_to_dict), ('列式+json', columnar_stdlib)]
+    if json_provider.orjson is not None:
+        cases.append(('列式+orjson', columnar_orjson))
+    else:
+        print('未安装orjson，跳过orjson测试')
+
+    print(f'任务数={count} 重复={repeat}（取最短耗时）')
+    print(f'{"实现":<20} {"耗时(ms)":>10} {"输出(KB)":>10}')
+    with app.app_context():
+        for label, func in cases:
+            elapsed, size = measure(func, repeat)
+            print(f'{label:<20} {elapsed * 1000:>10.1f} {size / 1024:>10.1f}')
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(args[0] if args else 10000, args[1] if len(args) > 1 else 5)
@@ -0,0 +1,83 @@
+# 启动时间基准测试：同时启动多个工作进程，测量从导入应用到返回第一个响应的耗时
+# 对比无副作用启动（数据库由 flask init-db 预先初始化）与每个进程启动时初始化数据库（旧行为）
+# 用法: python benchmarks/bench_startup.py [工作进程数] [重复次数] [任务数]
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# 必须在导入应用之前指定临时数据库
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'startup.db')
+
+from bench_utils import seed_tasks
+from app import app
+from db_setup import init_database
+from models import User
+
+MAIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 子进程：导入应用 ->（旧行为时初始化数据库）-> 以已登录用户请求任务列表
+WORKER_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {main_dir!r})
+from app import app
+imported = time.perf_counter()
+if {init_on_start!r}:
+    from db_setup import init_database
+    with app.app_context():
+        init_database(with_samples=True)
+client = app.test_client()
+with client.session_transaction() as session:
+    session['_user_id'] = {user_id!r}
+    session['_fresh'] = True
+status = client.get('/api/tasks?limit=50').status_code
+finished = time.perf_counter()
+print(json.dumps({{'import': imported - started, 'first_response': finished - started, 'status': status}}))
+'''
+
+MODES = [
+    ('无副作用启动', False),
+    ('启动时初始化（旧行为）', True),
+]
+
+def run_workers(workers, init_on_start, user_id):
+    """同时启动多个工作进程，返回 (各进程结果列表, 全部进程完成的耗时)"""
+    script = WORKER_SCRIPT.format(main_dir=MAIN_DIR, init_on_start=init_on_start, user_id=str(user_id))
+    started = time.perf_counter()
+    processes = [
+        subprocess.Popen([sys.executable, '-c', script], stdout=subprocess.PIPE, cwd=MAIN_DIR, text=True)
+        for _ in range(workers)
+    ]
+    results = []
+    for process in processes:
+        output, _ = process.communicate()
+        assert process.returncode == 0, process.returncode
+        result = json.loads(output.strip().splitlines()[-1])
+        assert result['status'] == 200, result['status']
+        results.append(result)
+    return results, time.perf_counter() - started
+
+def main(workers, repeat, count):
+    with app.app_context():
+        init_database(with_samples=True)
+    seed_tasks(app, count)
+    with app.app_context():
+        user_id = User.query.filter_by(username='bench').first().id
+
+    print(f'工作进程数={workers} 重复={repeat} 任务数={count}（取最短耗时）')
+    print(f'{"模式":<20} {"导入(ms)":>10} {"首个响应(ms)":>14} {"全部就绪(ms)":>14}')
+    for name, init_on_start in MODES:
+        imports, responses, walls = [], [], []
+        for _ in range(repeat):
+            results, wall = run_workers(workers, init_on_start, user_id)
+            imports.append(max(result['import'] for result in results))
+            responses.append(max(result['first_response'] for result in results))
+            walls.append(wall)
+        print(f'{name:<20} {min(imports) * 1000:>10.1f} {min(responses) * 1000:>14.1f} {min(walls) * 1000:>14.1f}')
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(args[0] if args else 4, args[1] if len(args) > 1 else 3, args[2] if len(args) > 2 else 10000)
@@ -0,0 +1,67 @@
+# 统计接口基准测试：对比加载全部ORM对象计数、GROUP BY 聚合和读取统计表（当前实现）的耗时和峰值内存
+# 用法: python benchmarks/bench_stats.py [任务数 ...]
+import multiprocessing
+import resource
+import sys
+import time
+
+from bench_utils import make_app, seed_tasks
+from sqlalchemy import func
+from models import db, Task
+import stats_service
+
+def count_in_python():
+    """旧实现：加载全部任务对象后在Python中计数"""
+    tasks = Task.query.all()
+    return {
+        'total_tasks': len(tasks),
+        'completed_tasks': len([t for t in tasks if t.status == 'completed']),
+        'in_progress_tasks': len([t for t in tasks if t.status == 'in-progress']),
+        'pending_tasks': len([t for t in tasks if t.status == 'pending'])
+    }
+
+def count_in_sql():
+    """数据库端单条 GROUP BY 聚合（每次请求仍需扫描任务表）"""
+    counts = dict(db.session.query(Task.status, func.count(Task.id)).group_by(Task.status).all())
+    return stats_service.build_stats(counts)
+
+def read_stats_table():
+    """当前实现：读取增量维护的统计表（单行主键查询）"""
+    return stats_service.get_task_stats()
+
+def _measure(db_path, func_name, queue):
+    """在子进程中执行一次统计，返回耗时和该进程的峰值RSS"""
+    app = make_app(db_path)
+    func = globals()[func_name]
+    with app.app_context():
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, baseline, peak))
+
+def measure(db_path, func_name):
+    queue = multiprocessing.Queue()
+    proc = multiprocessing.Process(target=_measure, args=(db_path, func_name, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+def main(sizes):
+    print(f'{"任务数":>10} {"实现":<8} {"耗时(ms)":>10} {"峰值RSS(MB)":>12} {"增量(MB)":>10}')
+    for size in sizes:
+        app = make_app()
+        seed_tasks(app, size)
+        with app.app_context():
+            # 批量插入不经过ORM事件，统计表需要全量计算一次
+            stats_service.rebuild_task_stats()
+        db_path = app.config['SQLALCHEMY_DATABASE_URI'].replace('sqlite:///', '', 1)
+        for label, func_name in [('ORM计数', 'count_in_python'), ('SQL聚合', 'count_in_sql'), ('统计表', 'read_stats_table')]:
+            elapsed, baseline, peak = measure(db_path, func_name)
+            # Linux 下 ru_maxrss 单位为KB
+            print(f'{size:>10} {label:<8} {elapsed * 1000:>10.1f} {peak / 1024:>12.1f} {(peak - baseline) / 1024:>10.1f}')
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000])
@@ -0,0 +1,92 @@
+# 基准测试公共工具 - 创建独立的临时数据库并批量生成任务数据
+import os
+import random
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+# 允许从 main 目录外直接运行基准脚本
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import event
+from models import db, Task, TaskCategory, User
+
+STATUSES = ['pending', 'in-progress', 'completed']
+ASSIGNEES = ['张三', '李四', '王五', '赵六', '钱七', None]
+
+def make_app(db_path=None):
+    """创建使用临时SQLite数据库的最小Flask应用（不触发示例数据初始化）"""
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+def seed_tasks(app, count, batch_size=10000):
+    """使用批量插入生成指定数量的任务"""
+    with app.app_context():
+        # 复用已有的分类和用户（数据库可能已由应用初始化）
+        category = TaskCategory.query.filter_by(name='general').first()
+        if category is None:
+            category = TaskCategory.create_category('general', '通用任务')
+            db.session.add(category)
+        user = User.query.filter_by(username='bench').first()
+        if user is None:
+            user = User(username='bench', full_name='基准用户', role='supervisor')
+            user.password_hash = '-'
+            db.session.add(user)
+        db.session.commit()
+
+        rng = random.Random(42)
+        start = datetime(2024, 1, 1)
+        for offset in range(0, count, batch_size):
+            rows = []
+            for i in range(offset, min(offset + batch_size, count)):
+                status = rng.choice(STATUSES)
+                progress = 100 if status == 'completed' else (0 if status == 'pending' else rng.randint(1, 99))
+                created_at = start + timedelta(seconds=i)
+                rows.append({
+                    'title': f'任务 {i}',
+                    'description': '基准测试任务描述' * 4,
+                    'status': status,
+                    'progress': progress,
+                    'assignee': rng.choice(ASSIGNEES),
+                    'category': 'general',
+                    'category_id': category.id,
+                    'creator_id': user.id,
+                    'created_at': created_at,
+                    'updated_at': created_at
+                })
+            db.session.execute(Task.__table__.insert(), rows)
+            db.session.commit()
+
+@contextmanager
+def capture_queries():
+    """记录代码块内执行的SQL语句，产出 [(语句, 参数)] 列表（需在应用上下文中使用，测试客户端的请求也会被记录）"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+def logged_in_client(app, username):
+    """创建以指定用户登录的测试客户端"""
+    with app.app_context():
+        user_id = User.query.filter_by(username=username).first().id
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return client
@@ -0,0 +1,83 @@
+# 并发读写负载测试：在持续调用 PUT /api/tasks/<id>/progress 的同时测量 GET /api/tasks 的吞吐量
+# 对比默认回滚日志模式与 WAL + synchronous=NORMAL 配置
+# 用法: python benchmarks/bench_wal_load.py [读线程数] [写线程数] [每轮秒数]
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+# 必须在导入应用之前指定临时数据库
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'load.db')
+
+from bench_utils import seed_tasks
+from app import app
+from db_setup import init_database
+from models import db, User
+
+MODES = [
+    ('回滚日志（默认）', {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL'}),
+    ('WAL + NORMAL', {'SQLITE_JOURNAL_MODE': 'WAL', 'SQLITE_SYNCHRONOUS': 'NORMAL'}),
+]
+
+def make_client(user_id):
+    """创建已登录的测试客户端"""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return client
+
+def run_mode(readers, writers, duration, user_id, task_ids):
+    """运行一轮负载，返回 (读次数, 写次数, 错误次数)"""
+    counts = {'read': 0, 'write': 0, 'error': 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def reader():
+        client = make_client(user_id)
+        while not stop.is_set():
+            ok = client.get('/api/tasks?limit=50').status_code == 200
+            with lock:
+                counts['read' if ok else 'error'] += 1
+
+    def writer():
+        client = make_client(user_id)
+        rng = random.Random()
+        while not stop.is_set():
+            task_id = rng.choice(task_ids)
+            response = client.put(f'/api/tasks/{task_id}/progress', json={'progress': rng.randint(1, 99)})
+            with lock:
+                counts['write' if response.status_code == 200 else 'error'] += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return counts['read'], counts['write'], counts['error']
+
+def main(readers, writers, duration):
+    with app.app_context():
+        init_database(with_samples=True)
+    seed_tasks(app, 10000)
+    with app.app_context():
+        user_id = User.query.filter_by(username='supervisor1').first().id
+        task_ids = [row[0] for row in db.session.execute(db.text('SELECT id FROM tasks LIMIT 1000'))]
+
+    print(f'读线程={readers} 写线程={writers} 每轮{duration}秒')
+    for label, settings in MODES:
+        app.config.update(settings)
+        with app.app_context():
+            # 丢弃旧连接，使新的PRAGMA配置生效
+            db.engine.dispose()
+        reads, writes, errors = run_mode(readers, writers, duration, user_id, task_ids)
+        print(f'{label:<16} 读 {reads / duration:>8.1f} 次/秒  写 {writes / duration:>7.1f} 次/秒  错误 {errors}')
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [8, 2, 10][len(args):]))
@@ -0,0 +1,66 @@
+# 任务列表查询次数检查：通过测试客户端请求实际的页面和接口，无论任务数量多少，每个请求执行的SQL语句数都不能超过固定上限
+# 用法: python benchmarks/check_query_counts.py [任务数 ...]（从小到大，依次追加任务）
+import os
+import sys
+import tempfile
+
+# 必须在导入应用之前指定临时数据库
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'query_counts.db')
+
+from bench_utils import seed_tasks, capture_queries, logged_in_client
+from app import app
+from db_setup import init_database
+from identity_cache import configure_user_cache
+from models import Task
+
+# (说明, 请求路径, SQL语句数上限)
+# 上限包含与任务数无关的固定查询：数据版本（ETag）、统计表、分类等；任务列表本身只能是一条查询
+LISTINGS = [
+    ('/tasks 页面', '/tasks', 2),
+    ('/tasks 筛选', '/tasks?status=pending&sort=planned_end_date', 2),
+    ('仪表板最近任务', '/', 2),
+    ('/api/tasks 接口', '/api/tasks?limit=50', 2),
+    ('/api/tasks 分面', '/api/tasks?limit=50&facets=1', 3),
+    ('/api/tasks 翻页', None, 2),
+]
+
+def next_page_path(client):
+    """第二页的请求路径（游标来自第一页的响应）"""
+    cursor = client.get('/api/tasks?limit=5').get_json()['next_cursor']
+    return f'/api/tasks?limit=5&cursor={cursor}'
+
+def main(sizes):
+    with app.app_context():
+        init_database()
+    # 只在第一个请求时检查用户表版本，避免每秒一次的检查混入计数
+    configure_user_cache(app.config['USER_CACHE_TTL'], float('inf'))
+
+    failures = 0
+    seeded = 0
+    client = None
+    for size in sizes:
+        seed_tasks(app, size - seeded)
+        seeded = size
+        if client is None:
+            # seed_tasks 创建的 bench 用户为监督员，可以访问全部任务页面和接口
+            client = logged_in_client(app, 'bench')
+            client.get('/api/tasks?limit=1')  # 预热：加载登录用户缓存
+        with app.app_context():
+            total = Task.query.count()
+        for label, path, budget in LISTINGS:
+            path = path or next_page_path(client)
+            # 每个请求使用新的会话，懒加载不会被身份映射缓存掩盖
+            with app.app_context():
+                with capture_queries() as statements:
+                    response = client.get(path)
+            ok = response.status_code == 200 and len(statements) <= budget
+            failures += not ok
+            print(f'{"OK" if ok else "FAIL":<4} {label:<14} 任务数={total:<6} 状态={response.status_code} '
+                  f'SQL语句数={len(statements)}（上限{budget}）')
+            if not ok:
+                for statement, _ in statements:
+                    print(f'       {" ".join(statement.split())[:160]}')
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main([int(arg) for arg in sys.argv[1:]] or [10, 1000]))
@@ -0,0 +1,83 @@
+# 热点查询执行计划检查：通过测试客户端请求实际的接口和页面，记录它们执行的SQL语句，
+# 对涉及任务表的每条语句运行 EXPLAIN QUERY PLAN，确认都走索引，且排序不需要临时B树
+# 用法: python benchmarks/check_query_plans.py
+import os
+import re
+import sys
+import tempfile
+
+# 必须在导入应用之前指定临时数据库
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'query_plans.db')
+
+from bench_utils import seed_tasks, capture_queries, logged_in_client
+from app import app
+from db_setup import init_database
+from models import db, User
+
+# 访问任务表的执行步骤（SCAN/SEARCH tasks ...）
+TASK_STEP = re.compile(r'^(SCAN|SEARCH) tasks\b')
+
+def hot_requests(creator_id):
+    """返回 (说明, 登录用户, 请求路径) 列表；路径为None时表示游标翻页（游标来自第一页）"""
+    return [
+        ('按状态筛选的任务列表', 'bench', '/api/tasks?status=pending&limit=50'),
+        ('全部任务列表', 'bench', '/api/tasks?limit=50'),
+        ('游标翻页', 'bench', None),
+        ('按创建者查询任务', 'bench', f'/api/tasks?creator_id={creator_id}&limit=50'),
+        ('按计划完成日期排序', 'bench', '/api/tasks?sort=planned_end_date&limit=50'),
+        ('按计划完成日期范围筛选', 'bench', '/api/tasks?planned_end_from=2024-03-01&limit=50'),
+        ('按负责人筛选', 'bench', '/api/tasks?assignee=张三&limit=50'),
+        ('仪表板最近任务', 'bench', '/'),
+        ('统计分类下的任务数', 'admin', '/admin/categories'),
+    ]
+
+def explain(statement, parameters):
+    """返回语句的执行计划文本行"""
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+    return [row[-1] for row in rows]
+
+def check_plan(plan):
+    """全表扫描任务表（未使用索引）或排序需要临时B树都视为失败"""
+    task_steps = [step for step in plan if TASK_STEP.match(step)]
+    if not task_steps:
+        return None
+    uses_index = all('USING' in step for step in task_steps)
+    needs_sort = any('TEMP B-TREE FOR ORDER BY' in step for step in plan)
+    return uses_index and not needs_sort
+
+def main():
+    with app.app_context():
+        init_database()
+    seed_tasks(app, 2000)
+    with app.app_context():
+        creator_id = User.query.filter_by(username='bench').first().id
+
+    clients = {username: logged_in_client(app, username) for username in ('bench', 'admin')}
+    failures = 0
+    for label, username, path in hot_requests(creator_id):
+        client = clients[username]
+        if path is None:
+            cursor = client.get('/api/tasks?status=pending&limit=50').get_json()['next_cursor']
+            path = f'/api/tasks?status=pending&limit=50&cursor={cursor}'
+        with app.app_context():
+            with capture_queries() as statements:
+                status = client.get(path).status_code
+            # 同一条语句（如逐个分类计数）只检查一次
+            unique = {statement: parameters for statement, parameters in statements
+                      if statement.lstrip().upper().startswith('SELECT')}
+            plans = [(statement, explain(statement, parameters)) for statement, parameters in unique.items()]
+
+        checked = [(statement, plan, check_plan(plan)) for statement, plan in plans]
+        checked = [item for item in checked if item[2] is not None]
+        ok = status == 200 and bool(checked) and all(result for _, _, result in checked)
+        failures += not ok
+        print(f'{"OK" if ok else "FAIL":<4} {label}（{path}，状态={status}）')
+        for statement, plan, result in checked:
+            print(f'     {"" if result else "! "}{" ".join(statement.split())[:120]}')
+            for step in plan:
+                print(f'       {step}')
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
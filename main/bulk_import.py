@@ -0,0 +1,149 @@
+# 批量导入模块 - 流式解析NDJSON/CSV并分批插入任务
+import csv
+import json
+from datetime import date, datetime
+from models import db, Task
+from stats_service import apply_inserted_rows
+
+# 每批插入并提交的默认行数
+DEFAULT_CHUNK_SIZE = 1000
+# 响应中最多返回的错误明细条数
+MAX_REPORTED_ERRORS = 1000
+
+# 可导入的任务字段
+IMPORT_FIELDS = ['title', 'description', 'status', 'progress', 'planned_start_date',
+                 'planned_end_date', 'assignee', 'category', 'category_id']
+
+def iter_ndjson(stream):
+    """
+    逐行解析NDJSON文本流
+    返回: (行号, 记录字典或None, 错误信息或None) 生成器
+    """
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_no, None, 'JSON格式错误'
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, '每行必须是JSON对象'
+            continue
+        yield line_no, record, None
+
+def iter_csv(stream):
+    """
+    逐行解析带表头的CSV文本流，空字符串视为未提供
+    返回: (行号, 记录字典或None, 错误信息或None) 生成器
+    """
+    reader = csv.DictReader(stream)
+    for record in reader:
+        # 表头占第1行，数据行号从2开始
+        line_no = reader.line_num
+        yield line_no, {key: value for key, value in record.items() if key and value not in (None, '')}, None
+
+def _parse_date(value):
+    """解析ISO格式日期字符串（YYYY-MM-DD）"""
+    if value is None or isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        raise ValueError(f'日期格式不合法：{value}')
+
+def _parse_int(value, message):
+    """将CSV中的数字字符串转换为整数"""
+    if value is None or isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(message)
+
+def build_task_row(record, creator_id, now):
+    """
+    使用 Task.create_task 的校验规则把一条导入记录转换为可批量插入的行
+    参数: record - 导入记录, creator_id - 创建者ID, now - 本批次的时间戳
+    返回: 列名到值的字典
+    """
+    task = Task.create_task(
+        title=record.get('title'),
+        description=record.get('description'),
+        status=record.get('status', 'pending'),
+        progress=_parse_int(record.get('progress', 0), '进度必须是0-100之间的整数'),
+        planned_start_date=_parse_date(record.get('planned_start_date')),
+        planned_end_date=_parse_date(record.get('planned_end_date')),
+        assignee=record.get('assignee'),
+        category=record.get('category'),
+        category_id=_parse_int(record.get('category_id'), '分类ID必须是整数'),
+        creator_id=creator_id
+    )
+    return {
+        'title': task.title,
+        'description': task.description,
+        'status': task.status,
+        'progress': task.progress,
+        'planned_start_date': task.planned_start_date,
+        'planned_end_date': task.planned_end_date,
+        'assignee': task.assignee,
+        'category': task.category,
+        'category_id': task.category_id,
+        'creator_id': task.creator_id,
+        'created_at': now,
+        'updated_at': now
+    }
+
+def _flush_chunk(rows, line_numbers, result):
+    """批量插入一批任务并提交，失败时整批回滚并记录错误"""
+    try:
+        db.session.execute(Task.__table__.insert(), rows)
+        # 批量插入不经过ORM刷新事件，需要手动更新统计表
+        apply_inserted_rows(db.session.connection(), rows)
+        db.session.commit()
+        result['imported'] += len(rows)
+    except Exception:
+        db.session.rollback()
+        for line_no in line_numbers:
+            _add_error(result, line_no, '写入数据库时发生错误')
+
+def _add_error(result, line_no, message):
+    """记录一条行级错误"""
+    result['failed'] += 1
+    if len(result['errors']) < MAX_REPORTED_ERRORS:
+        result['errors'].append({'line': line_no, 'error': message})
+
+def import_tasks(records, creator_id, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    校验并分批导入任务
+    参数:
+        records - iter_ndjson/iter_csv 产生的记录生成器
+        creator_id - 导入任务的创建者ID
+        chunk_size - 每个事务插入的行数
+    返回: {'imported': 成功数, 'failed': 失败数, 'errors': [{'line': 行号, 'error': 错误信息}]}
+    """
+    result = {'imported': 0, 'failed': 0, 'errors': []}
+    rows, line_numbers = [], []
+    now = datetime.utcnow()
+
+    for line_no, record, error in records:
+        if error:
+            _add_error(result, line_no, error)
+            continue
+        try:
+            rows.append(build_task_row(record, creator_id, now))
+            line_numbers.append(line_no)
+        except (ValueError, TypeError, AttributeError) as e:
+            _add_error(result, line_no, str(e) if isinstance(e, ValueError) else '字段类型不合法')
+            continue
+
+        if len(rows) >= chunk_size:
+            _flush_chunk(rows, line_numbers, result)
+            rows, line_numbers = [], []
+            now = datetime.utcnow()
+
+    if rows:
+        _flush_chunk(rows, line_numbers, result)
+
+    return result
@@ -0,0 +1,63 @@
+# 进程内缓存工具 - 带过期时间（TTL）和容量上限（LRU淘汰）的线程安全缓存
+import threading
+import time
+from collections import OrderedDict
+
+# 未命中时返回的哨兵值（区分缓存了None的情况）
+MISSING = object()
+
+class TTLCache:
+    """
+    线程安全的TTL + LRU缓存
+    参数:
+        maxsize - 最多缓存的条目数，超出时淘汰最久未使用的条目
+        ttl - 条目存活秒数
+    """
+
+    def __init__(self, maxsize=128, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=MISSING):
+        """读取缓存，过期或不存在时返回default"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """写入缓存"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_load(self, key, loader):
+        """读取缓存，未命中时调用loader()加载并写入缓存"""
+        value = self.get(key)
+        if value is MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def pop(self, key):
+        """删除单个条目"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
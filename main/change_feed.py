@@ -0,0 +1,340 @@
+# 任务变更推送模块 - 数据库触发器把任务的新增、修改、删除写入变更日志，通过Server-Sent Events推送给客户端
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from itertools import chain
+from sqlalchemy import event, func, select, text
+from sqlalchemy.orm import joinedload
+from models import db, Task, TaskChange
+
+# 这些字段都未变化（只修改了进度、状态）时记为进度更新（progress），否则记为普通修改（update）
+CONTENT_FIELDS = ('title', 'description', 'assignee', 'category', 'category_id',
+                  'creator_id', 'planned_start_date', 'planned_end_date')
+
+# 客户端断线后重连的等待毫秒数
+RECONNECT_DELAY_MS = 3000
+
+_content_unchanged = ' AND '.join(f'old.{field} IS new.{field}' for field in CONTENT_FIELDS)
+
+CHANGE_LOG_DDL = [
+    # 触发器覆盖所有写入路径：ORM、批量导入和集合式UPDATE
+    """CREATE TRIGGER IF NOT EXISTS task_changes_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO task_changes(task_id, action, changed_at) VALUES (new.id, 'create', CURRENT_TIMESTAMP);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS task_changes_au AFTER UPDATE ON tasks BEGIN
+        INSERT INTO task_changes(task_id, action, changed_at) VALUES (
+            new.id, CASE WHEN {_content_unchanged} THEN 'progress' ELSE 'update' END, CURRENT_TIMESTAMP
+        );
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_changes_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO task_changes(task_id, action, changed_at) VALUES (old.id, 'delete', CURRENT_TIMESTAMP);
+    END""",
+]
+
+def ensure_change_log():
+    """创建写入任务变更日志的触发器"""
+    with db.engine.begin() as conn:
+        for statement in CHANGE_LOG_DDL:
+            conn.execute(text(statement))
+
+class ChangeNotifier:
+    """
+    进程内的变更通知器
+    本进程提交任务修改后立即唤醒所有事件流；其他进程的修改由 poll 按固定间隔检查，
+    每个进程每个间隔最多执行一次查询，与打开的事件流数量无关
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._latest_seq = 0
+        self._polled_at = 0.0
+        self._listeners = set()
+
+    @property
+    def generation(self):
+        """通知代数，每次发布变更加一"""
+        return self._generation
+
+    def publish(self):
+        """唤醒所有等待中的事件流（包括异步事件流注册的回调）"""
+        with self._condition:
+            self._generation += 1
+            self._condition.notify_all()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+
+    def subscribe(self, listener):
+        """注册发布通知时调用的回调（异步事件流用它唤醒事件循环中的等待）"""
+        with self._condition:
+            self._listeners.add(listener)
+
+    def unsubscribe(self, listener):
+        """取消注册回调"""
+        with self._condition:
+            self._listeners.discard(listener)
+
+    def wait(self, generation, timeout):
+        """等待通知代数离开 generation，返回当前代数（超时则不变）"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._generation != generation, timeout)
+            return self._generation
+
+    def observe(self, seq):
+        """记录事件流已读到的变更序号，避免 poll 把这些变更当作其他进程的写入"""
+        with self._condition:
+            self._latest_seq = max(self._latest_seq, seq)
+
+    def poll_due(self, interval):
+        """距上次检查超过 interval 秒时返回True并记录本次检查时间"""
+        with self._condition:
+            now = time.monotonic()
+            if now - self._polled_at < interval:
+                return False
+            self._polled_at = now
+            return True
+
+    def publish_if_newer(self, seq):
+        """查询到的最新变更序号大于已知序号（其他进程写入了变更）时发布通知"""
+        with self._condition:
+            if seq <= self._latest_seq:
+                return
+            self._latest_seq = seq
+        self.publish()
+
+    def poll(self, interval, load_latest_seq):
+        """距上次检查超过 interval 秒时查询最新变更序号，发现新变更则发布通知"""
+        if self.poll_due(interval):
+            self.publish_if_newer(load_latest_seq())
+
+class StreamLimiter:
+    """
+    限制本进程同时打开的事件流数量
+    同步WSGI服务下每个事件流在整个连接期间占用一个工作线程，不加限制时少量页面就会占满线程池
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active = 0
+
+    @property
+    def active(self):
+        """当前打开的事件流数"""
+        return self._active
+
+    def try_acquire(self, limit):
+        """未达到上限时占用一个名额并返回True"""
+        with self._lock:
+            if limit is not None and self._active >= limit:
+                return False
+            self._active += 1
+            return True
+
+    def release(self):
+        """事件流结束时归还名额"""
+        with self._lock:
+            self._active -= 1
+
+notifier = ChangeNotifier()
+stream_limiter = StreamLimiter()
+
+def _mark_task_changes(session, flush_context):
+    """会话刷新时记录本事务修改了任务"""
+    if any(isinstance(obj, Task) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info['tasks_changed'] = True
+
+def _mark_bulk_task_changes(orm_execute_state):
+    """批量插入和集合式UPDATE/DELETE不经过刷新，按语句的目标表记录"""
+    is_write = orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete
+    if is_write and getattr(orm_execute_state.statement, 'table', None) is Task.__table__:
+        orm_execute_state.session.info['tasks_changed'] = True
+
+def _publish_task_changes(session):
+    """事务提交后通知事件流读取新的变更"""
+    if session.info.pop('tasks_changed', False):
+        notifier.publish()
+
+def _discard_task_changes(session):
+    """事务回滚时丢弃标记"""
+    session.info.pop('tasks_changed', None)
+
+def track_task_changes(session_target):
+    """在会话上注册任务变更通知（异步接口的会话类也通过它注册）"""
+    event.listen(session_target, 'after_flush', _mark_task_changes)
+    event.listen(session_target, 'do_orm_execute', _mark_bulk_task_changes)
+    event.listen(session_target, 'after_commit', _publish_task_changes)
+    event.listen(session_target, 'after_rollback', _discard_task_changes)
+
+track_task_changes(db.session)
+
+def latest_change_seq_select():
+    """最大变更序号的查询（主键，直接读取）"""
+    return select(func.max(TaskChange.seq))
+
+def latest_change_seq():
+    """当前最大的变更序号，没有变更时为0"""
+    return db.session.execute(latest_change_seq_select()).scalar() or 0
+
+def parse_last_event_id(value):
+    """
+    解析客户端的 Last-Event-ID
+    返回: 变更序号；未提供时返回None
+    """
+    if value in (None, ''):
+        return None
+    try:
+        seq = int(value)
+    except ValueError:
+        raise ValueError('Last-Event-ID必须是变更序号')
+    if seq < 0:
+        raise ValueError('Last-Event-ID必须是变更序号')
+    return seq
+
+def task_changes_select(last_seq, limit):
+    """序号大于 last_seq 的最多 limit 条变更的查询，按序号升序"""
+    return select(TaskChange).where(TaskChange.seq > last_seq).order_by(TaskChange.seq).limit(limit)
+
+def event_tasks_select(changes):
+    """变更涉及的未删除任务（预加载分类和创建者）的查询，没有需要读取的任务时返回None"""
+    task_ids = {change.task_id for change in changes if change.action != 'delete'}
+    if not task_ids:
+        return None
+    return select(Task).options(joinedload(Task.task_category), joinedload(Task.creator)).where(Task.id.in_(task_ids))
+
+def build_task_events(changes, tasks):
+    """
+    组合变更和任务的当前数据（已删除的任务为None）
+    返回: [{'seq', 'action', 'task_id', 'changed_at', 'task'}]，按序号升序
+    """
+    return [{
+        'seq': change.seq,
+        'action': change.action,
+        'task_id': change.task_id,
+        'changed_at': change.changed_at.isoformat(),
+        'task': tasks[change.task_id].to_dict() if change.task_id in tasks else None
+    } for change in changes]
+
+def load_task_events(last_seq, limit):
+    """读取序号大于 last_seq 的变更，并附带任务的当前数据，返回值见 build_task_events"""
+    changes = db.session.execute(task_changes_select(last_seq, limit)).scalars().all()
+    stmt = event_tasks_select(changes)
+    tasks = {task.id: task for task in db.session.execute(stmt).scalars()} if stmt is not None else {}
+    return build_task_events(changes, tasks)
+
+def format_event(task_event):
+    """格式化为一条SSE消息，事件类型为变更类型"""
+    data = json.dumps(task_event, ensure_ascii=False)
+    return f'id: {task_event["seq"]}\nevent: {task_event["action"]}\ndata: {data}\n\n'
+
+def stream_task_events(last_seq, poll_interval, heartbeat_interval, max_seconds, batch_size):
+    """
+    生成任务变更事件流
+    参数:
+        last_seq - 从该序号之后开始推送
+        poll_interval - 检查其他进程写入的间隔秒数
+        heartbeat_interval - 无变更时发送心跳注释的间隔秒数（防止代理断开空闲连接）
+        max_seconds - 单个连接的最长持续秒数，到期后客户端带着 Last-Event-ID 自动重连
+        batch_size - 每次最多读取的变更条数
+    """
+    deadline = time.monotonic() + max_seconds
+    last_sent = time.monotonic()
+    generation = notifier.generation
+    has_new = True  # 连接建立时先补发 last_seq 之后的变更
+
+    yield f'retry: {RECONNECT_DELAY_MS}\n\n'
+    while time.monotonic() < deadline:
+        if has_new:
+            events = load_task_events(last_seq, batch_size)
+            # 立即结束读事务并归还连接：不占用连接池，也不会停留在旧的数据快照上
+            db.session.close()
+            for task_event in events:
+                yield format_event(task_event)
+            if events:
+                last_seq = events[-1]['seq']
+                notifier.observe(last_seq)
+                last_sent = time.monotonic()
+            # 读满一批说明可能还有未发送的变更
+            has_new = len(events) == batch_size
+            if has_new:
+                continue
+
+        # 等待本进程的提交通知；没有变更时不查询数据库
+        current = notifier.wait(generation, poll_interval)
+        if current != generation:
+            generation, has_new = current, True
+            continue
+
+        notifier.poll(poll_interval, _load_latest_seq_and_close)
+        if time.monotonic() - last_sent >= heartbeat_interval:
+            yield ': keepalive\n\n'
+            last_sent = time.monotonic()
+
+def _load_latest_seq_and_close():
+    """查询最新变更序号后立即归还连接"""
+    try:
+        return latest_change_seq()
+    finally:
+        db.session.close()
+
+class ChangeLogExpired(RuntimeError):
+    """请求的起始序号之后的部分变更日志已被清理，客户端需要全量同步"""
+
+    def __init__(self, latest_seq):
+        super().__init__('变更日志已过期，请重新全量同步')
+        self.latest_seq = latest_seq
+
+def load_changes_since(since, limit):
+    """
+    增量同步：读取序号大于 since 的最多 limit 条变更日志，按任务合并
+    只扫描主键范围 seq > since，查询代价与变更数量成正比，与任务总数无关
+    参数:
+        since - 客户端上次同步到的变更序号
+        limit - 本次最多读取的变更日志条数
+    返回: {'tasks': 新增或修改的任务（当前数据）, 'deleted': 已删除的任务ID,
+          'next_since': 下次同步使用的序号, 'has_more': 是否还有未读取的变更}
+    异常: since 之后的日志已被清理时抛出 ChangeLogExpired
+    """
+    oldest_seq, latest_seq = db.session.query(func.min(TaskChange.seq), func.max(TaskChange.seq)).one()
+    if oldest_seq is not None and since < oldest_seq - 1:
+        raise ChangeLogExpired(latest_seq)
+
+    changes = (db.session.query(TaskChange.seq, TaskChange.task_id, TaskChange.action)
+               .filter(TaskChange.seq > since)
+               .order_by(TaskChange.seq)
+               .limit(limit)
+               .all())
+
+    # 同一任务的多次变更只保留最后一次
+    last_actions = {}
+    for change in changes:
+        last_actions[change.task_id] = change.action
+
+    live_ids = [task_id for task_id, action in last_actions.items() if action != 'delete']
+    tasks = []
+    if live_ids:
+        tasks = Task.query_with_relations().filter(Task.id.in_(live_ids)).order_by(Task.id).all()
+    # 本批次之后才被删除的任务也作为删除返回
+    found_ids = {task.id for task in tasks}
+    deleted = sorted(task_id for task_id in last_actions if task_id not in found_ids)
+
+    return {
+        'tasks': [task.to_dict() for task in tasks],
+        'deleted': deleted,
+        'next_since': changes[-1].seq if changes else max(since, latest_seq or 0),
+        'has_more': len(changes) == limit
+    }
+
+def prune_change_log(retention_days):
+    """
+    删除早于保留天数的变更日志（始终保留最新一条，用于判断客户端的起始序号是否过期）
+    返回: 删除的条数
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    latest_seq = latest_change_seq()
+    deleted = (TaskChange.query
+               .filter(TaskChange.changed_at < cutoff, TaskChange.seq < latest_seq)
+               .delete(synchronize_session=False))
+    db.session.commit()
+    return deleted
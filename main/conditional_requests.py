@@ -0,0 +1,64 @@
+# HTTP条件请求模块 - 为任务API生成ETag，数据未变化时返回304，更新时根据If-Match做乐观并发控制
+import hashlib
+from flask import request, make_response
+from sqlalchemy import func, select
+from models import db, User, TaskCategory, TaskChange
+
+def collection_version_select():
+    """
+    任务集合数据版本的查询：任务变更日志的最大序号，加上用户表和分类表的行数和最近更新时间
+    变更日志由触发器在任务新增、修改、删除时写入（清理时保留最新一条），最大序号通过主键直接读取，
+    不随任务数增长；任务JSON中包含创建者姓名，统计中包含分类名称，这两张小表的变化也计入版本
+    """
+    parts = [select(func.max(TaskChange.seq)).scalar_subquery()]
+    for model in (User, TaskCategory):
+        parts.append(select(func.count(model.id)).scalar_subquery())
+        parts.append(select(func.max(model.updated_at)).scalar_subquery())
+    return select(*parts)
+
+def collection_version(row=None):
+    """
+    任务集合的数据版本字符串
+    参数: row - collection_version_select 的结果行（异步接口已自行查询时传入），为None时查询
+    """
+    if row is None:
+        row = db.session.execute(collection_version_select()).one()
+    return '|'.join(str(value) for value in row)
+
+def collection_etag(name, version=None):
+    """
+    生成集合接口的弱ETag（不含引号）
+    参数:
+        name - 接口名称，不同接口的同一数据版本生成不同的ETag
+        version - 已读取的数据版本字符串，为None时查询
+    """
+    if version is None:
+        version = collection_version()
+    version = f'{name}|{version}'
+    return hashlib.sha1(version.encode('utf-8')).hexdigest()[:20]
+
+def task_etag(task):
+    """根据任务ID和更新时间生成单个任务的强ETag（不含引号）"""
+    return f'{task.id}-{task.updated_at.strftime("%Y%m%d%H%M%S%f")}'
+
+def not_modified_response(etag, weak=False):
+    """
+    客户端缓存的ETag与当前ETag相同时返回304响应，否则返回None
+    GET请求的 If-None-Match 使用弱比较
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+        set_etag(response, etag, weak)
+        return response
+    return None
+
+def if_match_failed(etag):
+    """请求带有 If-Match 且与当前ETag不匹配（强比较）时返回True，此时应返回412"""
+    if_match = request.if_match
+    return bool(if_match) and not if_match.contains(etag)
+
+def set_etag(response, etag, weak=False):
+    """设置ETag，并要求浏览器每次使用缓存前先向服务器验证"""
+    response.set_etag(etag, weak=weak)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
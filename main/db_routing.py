@@ -0,0 +1,88 @@
+# 读写分离模块 - 只读接口的查询路由到只读副本，写操作和刷新始终使用主库
+import sqlite3
+import time
+from functools import wraps
+from flask import current_app, g, has_request_context, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+# 只读副本在 SQLALCHEMY_BINDS 中的键名
+REPLICA_BIND_KEY = 'replica'
+# 会话中记录用户最近一次写操作时间的键名
+LAST_WRITE_SESSION_KEY = 'db_last_write'
+
+class RoutingSession(Session):
+    """
+    支持读写分离的会话类
+    在标记为只读的请求中，查询使用只读副本；刷新（flush）和 INSERT/UPDATE/DELETE 语句使用主库
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            is_write = self._flushing or isinstance(clause, UpdateBase)
+            if is_write:
+                _mark_write()
+            elif _use_replica():
+                replica = self._db.engines.get(REPLICA_BIND_KEY)
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def _mark_write():
+    """记录当前请求执行过写操作"""
+    if has_request_context():
+        g.db_wrote = True
+
+def _use_replica():
+    """当前请求是否应使用只读副本"""
+    return has_request_context() and g.get('db_read_only', False) and not g.get('db_wrote', False)
+
+def read_only_db(f):
+    """
+    只读接口装饰器：视图内的查询使用只读副本
+    用户在 REPLICA_STICKY_SECONDS 秒内执行过写操作时仍使用主库，保证能读到自己刚写入的数据
+    应放在权限装饰器之后（紧贴视图函数），使登录用户的加载和权限检查仍使用主库
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        sticky_seconds = current_app.config.get('REPLICA_STICKY_SECONDS', 0)
+        last_write = session.get(LAST_WRITE_SESSION_KEY, 0)
+        if time.time() - last_write >= sticky_seconds:
+            g.db_read_only = True
+        return f(*args, **kwargs)
+    return decorated_function
+
+def init_db_routing(app):
+    """注册请求结束时记录写操作时间的钩子（仅在配置了只读副本时生效）"""
+    if REPLICA_BIND_KEY not in app.config.get('SQLALCHEMY_BINDS', {}):
+        return
+
+    @app.after_request
+    def remember_last_write(response):
+        if g.get('db_wrote', False):
+            session[LAST_WRITE_SESSION_KEY] = time.time()
+        return response
+
+def copy_primary_to_replica(db):
+    """
+    将主库完整复制到只读副本（本地测试用的复制任务，仅支持SQLite文件数据库）
+    使用SQLite在线备份接口，复制期间主库可以继续读写
+    """
+    primary = db.engines[None]
+    replica = db.engines.get(REPLICA_BIND_KEY)
+    if replica is None:
+        raise RuntimeError('未配置只读副本（SQLALCHEMY_BINDS["replica"]）')
+    if primary.dialect.name != 'sqlite' or replica.dialect.name != 'sqlite':
+        raise RuntimeError('复制任务仅支持SQLite数据库')
+
+    # 释放副本连接池中的连接，避免复制时文件被占用
+    replica.dispose()
+    source = primary.raw_connection()
+    try:
+        target = sqlite3.connect(replica.url.database)
+        try:
+            source.driver_connection.backup(target)
+        finally:
+            target.close()
+    finally:
+        source.close()
@@ -0,0 +1,170 @@
+# 数据库初始化模块 - 建表、补建索引和触发器、写入默认数据
+# 由 flask init-db / flask seed 命令在部署时执行一次，应用启动（create_app）不访问数据库
+from datetime import date
+from models import db, Task, User, TaskCategory, TaskStat, ensure_indexes
+from search_service import ensure_search_index
+from change_feed import ensure_change_log
+from stats_service import rebuild_task_stats
+
+def init_schema():
+    """
+    创建所有表，并为旧版本数据库补建索引、全文索引和变更日志触发器
+    返回: FTS5全文索引是否可用
+    """
+    db.create_all()  # 创建所有数据库表
+    ensure_indexes()  # 为旧版本数据库补建索引
+    fts_enabled = ensure_search_index()  # 创建全文搜索索引
+    ensure_change_log()  # 创建任务变更日志触发器
+    
+    # 统计表缺少汇总行时（新建或旧版本数据库），根据任务表全量生成
+    if db.session.get(TaskStat, ('all', '')) is None:
+        rebuild_task_stats()
+    return fts_enabled
+
+def create_default_admin():
+    """创建默认管理员账户（如果不存在）"""
+    admin_user = User.query.filter_by(username='admin').first()
+    if not admin_user:
+        admin_user = User(
+            username='admin',
+            full_name='系统管理员',
+            role='admin',
+            is_active=True
+        )
+        admin_user.set_password('admin123')  # 默认密码，生产环境需修改
+        db.session.add(admin_user)
+        db.session.commit()
+
+def create_default_categories():
+    """创建默认任务分类（如果不存在）"""
+    if TaskCategory.query.count() > 0:
+        return
+    
+    default_categories = [
+        TaskCategory.create_category('general', '通用任务', '默认的通用任务分类', 'secondary', True, 0),
+        TaskCategory.create_category('development', '开发任务', '软件开发相关任务', 'primary', True, 1),
+        TaskCategory.create_category('design', '设计任务', 'UI/UX设计相关任务', 'info', True, 2),
+        TaskCategory.create_category('testing', '测试任务', '软件测试相关任务', 'warning', True, 3),
+        TaskCategory.create_category('deployment', '部署任务', '系统部署相关任务', 'success', True, 4),
+        TaskCategory.create_category('meeting', '会议任务', '会议和沟通相关任务', 'dark', True, 5),
+        TaskCategory.create_category('research', '研究任务', '研究和调研相关任务', 'light', True, 6)
+    ]
+
+    for category in default_categories:
+        db.session.add(category)
+
+    db.session.commit()
+
+def seed_sample_data():
+    """
+    数据库中没有任务时添加示例用户和示例任务
+    返回: 是否写入了示例数据
+    """
+    if Task.query.count() > 0:
+        return False
+    
+    # 创建示例用户
+    sample_users = [
+        User(
+            username='data_entry1',
+            full_name='录入员一',
+            role='data_entry',
+            is_active=True
+        ),
+        User(
+            username='supervisor1',
+            full_name='监督员一',
+            role='supervisor',
+            is_active=True
+        )
+    ]
+
+    for user in sample_users:
+        user.set_password('123456')  # 默认密码
+        db.session.add(user)
+
+    db.session.commit()
+
+    # 获取创建的用户ID
+    data_entry_user = User.query.filter_by(username='data_entry1').first()
+
+    # 确保用户存在
+    if not data_entry_user:
+        raise Exception('无法创建示例任务：找不到data_entry1用户')
+
+    sample_tasks = [
+        Task.create_task(
+            title="搭建开发环境", 
+            description="安装Python、Flask和相关依赖包，配置开发环境", 
+            status="completed", 
+            progress=100,
+            planned_start_date=date(2024, 1, 1), 
+            planned_end_date=date(2024, 1, 5),
+            assignee="张三", 
+            category="development",
+            creator_id=data_entry_user.id
+        ),
+        Task.create_task(
+            title="设计数据库架构", 
+            description="创建SQLAlchemy数据模型，设计任务管理数据表结构", 
+            status="completed", 
+            progress=100,
+            planned_start_date=date(2024, 1, 6), 
+            planned_end_date=date(2024, 1, 10),
+            assignee="李四", 
+            category="development",
+            creator_id=data_entry_user.id
+        ),
+        Task.create_task(
+            title="实现后端API接口", 
+            description="开发Flask路由和RESTful API接口，实现CRUD操作", 
+            status="in-progress", 
+            progress=75,
+            planned_start_date=date(2024, 1, 11), 
+            planned_end_date=date(2024, 1, 20),
+            assignee="王五", 
+            category="development",
+            creator_id=data_entry_user.id
+        ),
+        Task.create_task(
+            title="创建前端页面模板", 
+            description="使用Bootstrap设计响应式HTML模板和用户界面", 
+            status="pending", 
+            progress=0,
+            planned_start_date=date(2024, 1, 21), 
+            planned_end_date=date(2024, 1, 30),
+            assignee="赵六", 
+            category="design",
+            creator_id=data_entry_user.id
+        ),
+        Task.create_task(
+            title="添加用户认证系统", 
+            description="实现用户登录、注册和权限管理功能模块", 
+            status="pending", 
+            progress=0,
+            planned_start_date=date(2024, 2, 1), 
+            planned_end_date=date(2024, 2, 15),
+            assignee="钱七", 
+            category="development",
+            creator_id=data_entry_user.id
+        )
+    ]
+
+    # 将示例任务添加到数据库
+    for task in sample_tasks:
+        db.session.add(task)
+
+    db.session.commit()  # 提交数据库事务
+    return True
+
+def init_database(with_samples=False):
+    """
+    初始化数据库：表结构、默认管理员和默认分类，可选写入示例数据（可重复执行）
+    返回: FTS5全文索引是否可用
+    """
+    fts_enabled = init_schema()
+    create_default_admin()
+    create_default_categories()
+    if with_samples:
+        seed_sample_data()
+    return fts_enabled
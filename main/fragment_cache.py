@@ -0,0 +1,41 @@
+# 模板片段缓存模块 - 缓存单个任务渲染出的HTML片段，列表页面只重新渲染发生变化的任务
+from flask import current_app
+from flask_login import current_user
+from markupsafe import Markup
+from cache_utils import TTLCache, MISSING
+
+# 片段缓存：键包含任务和关联数据的版本，数据变化后自然使用新键，旧片段由LRU淘汰
+fragment_cache = TTLCache(maxsize=4096, ttl=3600)
+
+def _version(obj):
+    """关联对象（分类、创建者）的版本，不存在时为None"""
+    return obj.updated_at if obj is not None else None
+
+def task_fragment_key(template_name, task, role, is_own):
+    """
+    片段缓存键
+    任务自身的修改体现在 updated_at；分类和创建者的修改体现在各自的 updated_at；
+    片段中的按钮和提示只与查看者的角色以及任务是否由本人创建有关
+    """
+    return (template_name, task.id, task.updated_at, _version(task.task_category),
+            _version(task.creator), role, is_own)
+
+def render_task_fragment(template_name, task):
+    """
+    渲染单个任务的片段（模板中通过 task_fragment(模板名, task) 调用），命中缓存时直接返回
+    task 需预加载分类和创建者（Task.query_with_relations）
+    """
+    role = current_user.role
+    is_own = task.creator_id == current_user.id
+    key = task_fragment_key(template_name, task, role, is_own)
+    html = fragment_cache.get(key)
+    if html is MISSING:
+        template = current_app.jinja_env.get_template(template_name)
+        html = Markup(template.render(task=task, role=role, is_own=is_own))
+        fragment_cache.set(key, html)
+    return html
+
+def init_fragment_cache(app):
+    """按配置设置缓存容量，并注册模板全局函数 task_fragment"""
+    fragment_cache.maxsize = app.config['FRAGMENT_CACHE_SIZE']
+    app.jinja_env.globals['task_fragment'] = render_task_fragment
@@ -0,0 +1,105 @@
+# 登录用户缓存模块 - 缓存 user_loader 加载的用户，避免每个请求都查询用户表
+import threading
+import time
+from sqlalchemy import func, inspect, select
+from sqlalchemy.orm import make_transient_to_detached
+from cache_utils import TTLCache, MISSING
+from models import db, User
+
+# 用户缓存：键为 user_cache_version 返回的版本，值为用户字段快照
+user_cache = TTLCache(maxsize=1024, ttl=30)
+
+# 每个用户的版本号，管理员修改、重置密码或删除用户后递增，使本进程内的旧缓存立即失效
+_user_versions = {}
+_versions_lock = threading.Lock()
+
+# 用户表的数据版本（行数和最近更新时间）：其他进程修改用户后该值变化，本进程的缓存代数随之递增，
+# 全部旧缓存失效；每个进程每隔 check_seconds 秒最多检查一次
+_table_state = {'version': None, 'generation': 0, 'checked_at': None, 'check_seconds': 1.0}
+
+def bump_user_version(user_id):
+    """递增用户版本号（在修改提交后调用），本进程内该用户的缓存立即失效"""
+    with _versions_lock:
+        _user_versions[user_id] = _user_versions.get(user_id, 0) + 1
+
+def user_cache_version(user_id):
+    """
+    用户当前的缓存键（缓存代数, 用户ID, 用户版本号）
+    加载前取一次并传给 get_cached_user 和 cache_user：加载期间版本递增时，
+    写入的快照留在旧键下，之后的请求使用新键重新加载
+    """
+    with _versions_lock:
+        return (_table_state['generation'], user_id, _user_versions.get(user_id, 0))
+
+def users_version_select():
+    """用户表数据版本的查询（新增、修改、删除用户都会改变行数或最近更新时间）"""
+    return select(func.count(User.id), func.max(User.updated_at))
+
+def users_version_check_due():
+    """距上次检查用户表版本已超过间隔时返回True并记录本次检查时间"""
+    now = time.monotonic()
+    with _versions_lock:
+        checked_at = _table_state['checked_at']
+        if checked_at is not None and now - checked_at < _table_state['check_seconds']:
+            return False
+        _table_state['checked_at'] = now
+        return True
+
+def observe_users_version(row):
+    """记录查询到的用户表版本，与上次不同时（其他进程修改了用户）使本进程的全部用户缓存失效"""
+    version = tuple(row)
+    with _versions_lock:
+        if _table_state['version'] is not None and version != _table_state['version']:
+            _table_state['generation'] += 1
+        _table_state['version'] = version
+
+def configure_user_cache(ttl, check_seconds):
+    """设置缓存秒数和检查用户表版本的间隔"""
+    user_cache.ttl = ttl
+    _table_state['check_seconds'] = check_seconds
+
+def _snapshot(user):
+    """提取用户的列字段值"""
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+def _restore(snapshot):
+    """根据快照构造一个游离（detached）状态的用户对象，每次调用返回新对象，避免跨线程共享"""
+    # 通过ORM类管理器创建实例，跳过 User.__init__ 的默认值逻辑
+    user = inspect(User).class_manager.new_instance()
+    for key, value in snapshot.items():
+        setattr(user, key, value)
+    make_transient_to_detached(user)
+    return user
+
+def get_cached_user(version):
+    """
+    只读取缓存，不查询数据库（异步接口自行查询后调用 cache_user 写入）
+    参数: version - user_cache_version 的返回值
+    返回: 用户对象、None（用户不存在）或 MISSING（未缓存）
+    """
+    snapshot = user_cache.get(version)
+    if snapshot is MISSING or snapshot is None:
+        return snapshot
+    return _restore(snapshot)
+
+def cache_user(version, user):
+    """
+    把查询到的用户（不存在时为None）写入加载前取得的版本下
+    返回: 与 load_cached_user 相同的游离用户对象或None
+    """
+    snapshot = _snapshot(user) if user else None
+    user_cache.set(version, snapshot)
+    return _restore(snapshot) if snapshot else None
+
+def load_cached_user(user_id):
+    """
+    按ID加载用户，优先使用缓存
+    返回: 用户对象（不属于当前会话，只用于读取字段）或None
+    """
+    if users_version_check_due():
+        observe_users_version(db.session.execute(users_version_select()).one())
+    version = user_cache_version(user_id)
+    user = get_cached_user(version)
+    if user is MISSING:
+        user = cache_user(version, db.session.get(User, user_id))
+    return user
@@ -0,0 +1,50 @@
+# JSON序列化模块 - 已安装orjson时用它编码API响应，否则使用Flask默认的标准库实现
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson是可选依赖
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    使用orjson的JSON提供者
+    日期时间和dataclass交回Flask默认规则处理，输出内容与标准库实现一致
+    """
+
+    # 不排序键：字段顺序与字典构造顺序一致，省去排序开销
+    sort_keys = False
+
+    def _options(self, indent=False):
+        """组合orjson编码选项"""
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        # 带自定义参数的调用交给标准库处理
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """直接把orjson输出的字节作为响应体，省去字符串编解码"""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent)) + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def init_json_provider(app):
+    """配置启用且已安装orjson时替换应用的JSON提供者，返回是否启用"""
+    if orjson is None or not app.config.get('JSON_USE_ORJSON', True):
+        return False
+    app.json = OrjsonProvider(app)
+    return True
@@ -1,14 +1,31 @@
 # 导入Flask SQLAlchemy扩展
 from flask_sqlalchemy import SQLAlchemy
+# 导入关系预加载选项和会话事件
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload
+# 导入命名元组用于缓存分类快照
+from collections import namedtuple
+# 导入进程内缓存
+from cache_utils import TTLCache
 # 导入datetime模块用于时间戳
 from datetime import datetime
 # 导入Flask-Login扩展用于用户会话管理
 from flask_login import UserMixin
-# 导入Werkzeug用于密码加密
-from werkzeug.security import generate_password_hash, check_password_hash
+# 导入密码哈希线程池
+from password_hashing import get_password_hasher
+
+# 导入读写分离会话类
+from db_routing import RoutingSession
+
+# 创建SQLAlchemy数据库实例（使用支持只读副本路由的会话类）
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# 启用分类的缓存快照（只保存纯数据，避免跨会话使用ORM对象）
+CategoryInfo = namedtuple('CategoryInfo', ['id', 'name', 'display_name', 'color'])
+
+# 启用分类缓存：分类很少变化，写入分类时清空，TTL兜底其他进程的修改
+category_cache = TTLCache(maxsize=256, ttl=60)
 
-# 创建SQLAlchemy数据库实例
-db = SQLAlchemy()
 
 class User(UserMixin, db.Model):
     """用户模型类，用于存储用户信息和权限管理"""
@@ -64,12 +81,16 @@ class User(UserMixin, db.Model):
         return f'<User {self.username}: {self.get_role_display()}>'
     
     def set_password(self, password):
-        """设置用户密码（加密存储）"""
-        self.password_hash = generate_password_hash(password)
+        """设置用户密码（加密存储，在哈希线程池中计算）"""
+        self.password_hash = get_password_hasher().hash(password)
     
     def check_password(self, password):
-        """验证用户密码"""
-        return check_password_hash(self.password_hash, password)
+        """验证用户密码（在哈希线程池中计算）"""
+        return get_password_hasher().verify(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        """检查密码哈希是否使用了旧的算法或参数，需要在下次登录时升级"""
+        return get_password_hasher().needs_rehash(self.password_hash)
     
     def get_role_display(self):
         """获取用户角色的中文显示名称"""
@@ -128,6 +149,7 @@ class User(UserMixin, db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+
 class TaskCategory(db.Model):
     """任务分类模型类，用于管理任务分类"""
     
@@ -228,9 +250,30 @@ class TaskCategory(db.Model):
     
     @staticmethod
     def get_choices_for_form():
-        """获取表单选择项格式的分类列表"""
-        categories = TaskCategory.get_active_categories()
-        return [(cat.name, cat.display_name) for cat in categories]
+        """获取表单选择项格式的分类列表（使用缓存）"""
+        def load():
+            categories = TaskCategory.get_active_categories()
+            return [(cat.name, cat.display_name) for cat in categories]
+        # 返回副本，避免调用方修改缓存内容
+        return list(category_cache.get_or_load('choices', load))
+    
+    @staticmethod
+    def _load_active(**filters):
+        """查询单个启用分类并转换为缓存快照，不存在时返回None"""
+        category = TaskCategory.query.filter_by(is_active=True, **filters).first()
+        if not category:
+            return None
+        return CategoryInfo(category.id, category.name, category.display_name, category.color)
+    
+    @staticmethod
+    def get_active_by_id(category_id):
+        """按ID获取启用的分类（使用缓存），返回CategoryInfo或None"""
+        return category_cache.get_or_load(('id', category_id), lambda: TaskCategory._load_active(id=category_id))
+    
+    @staticmethod
+    def get_active_by_name(name):
+        """按名称获取启用的分类（使用缓存），返回CategoryInfo或None"""
+        return category_cache.get_or_load(('name', name), lambda: TaskCategory._load_active(name=name))
     
     def to_dict(self):
         """将分类对象转换为字典，用于JSON序列化"""
@@ -247,6 +290,7 @@ class TaskCategory(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+
 class Task(db.Model):
     """任务模型类，用于存储任务信息"""
     
@@ -279,12 +323,31 @@ class Task(db.Model):
         db.CheckConstraint(status.in_(['pending', 'in-progress', 'completed']), name='valid_status'),
         # 进度值必须在0-100之间
         db.CheckConstraint('progress >= 0 AND progress <= 100', name='valid_progress'),
+        # 按状态筛选并按创建时间倒序排列（任务列表、游标分页）
+        db.Index('ix_tasks_status_created_at', 'status', 'created_at', 'id'),
+        # 不筛选状态时按创建时间倒序排列
+        db.Index('ix_tasks_created_at', 'created_at', 'id'),
+        # 按创建者筛选并按创建时间倒序排列（也用于权限检查、删除用户时解除关联）
+        db.Index('ix_tasks_creator_id_created_at', 'creator_id', 'created_at', 'id'),
+        # 按分类统计（删除分类前检查）
+        db.Index('ix_tasks_category_id', 'category_id'),
+        # 按更新时间排序
+        db.Index('ix_tasks_updated_at', 'updated_at'),
+        # 按计划日期范围筛选和排序
+        db.Index('ix_tasks_planned_start_date', 'planned_start_date'),
+        db.Index('ix_tasks_planned_end_date', 'planned_end_date'),
+        # 按负责人筛选并按创建时间倒序排列
+        db.Index('ix_tasks_assignee_created_at', 'assignee', 'created_at', 'id'),
     )
     
     def __repr__(self):
         """返回对象的字符串表示"""
         return f'<Task {self.id}: {self.title}>'
     
+    @classmethod
+    def query_with_relations(cls):
+        """返回预加载分类和创建者关系的任务查询，避免列表渲染时逐行懒加载（N+1查询）"""
+        return cls.query.options(joinedload(cls.task_category), joinedload(cls.creator))
 
     
     @classmethod
@@ -306,7 +369,7 @@ class Task(db.Model):
         # 验证任务分类（支持新旧两种方式）
         if category_id:
             # 使用新的动态分类系统
-            task_category = TaskCategory.query.filter_by(id=category_id, is_active=True).first()
+            task_category = TaskCategory.get_active_by_id(category_id)
             if not task_category:
                 raise ValueError("指定的任务分类不存在或已禁用")
         elif category:
@@ -314,14 +377,14 @@ class Task(db.Model):
             valid_categories = ['general', 'development', 'design', 'testing', 'deployment', 'meeting', 'research']
             if category not in valid_categories:
                 # 尝试查找对应的动态分类
-                task_category = TaskCategory.query.filter_by(name=category, is_active=True).first()
+                task_category = TaskCategory.get_active_by_name(category)
                 if task_category:
                     category_id = task_category.id
                 else:
                     raise ValueError(f"任务分类不合法")
         else:
             # 默认使用通用任务分类
-            default_category = TaskCategory.query.filter_by(name='general', is_active=True).first()
+            default_category = TaskCategory.get_active_by_name('general')
             if default_category:
                 category_id = default_category.id
                 category = default_category.name
@@ -399,7 +462,7 @@ class Task(db.Model):
             
             if category_id:
                 # 使用新的动态分类系统
-                task_category = TaskCategory.query.filter_by(id=category_id, is_active=True).first()
+                task_category = TaskCategory.get_active_by_id(category_id)
                 if not task_category:
                     raise ValueError("指定的任务分类不存在或已禁用")
                 self.category_id = category_id
@@ -410,12 +473,12 @@ class Task(db.Model):
                 if category in valid_categories:
                     self.category = category
                     # 尝试查找对应的动态分类
-                    task_category = TaskCategory.query.filter_by(name=category, is_active=True).first()
+                    task_category = TaskCategory.get_active_by_name(category)
                     if task_category:
                         self.category_id = task_category.id
                 else:
                     # 尝试查找对应的动态分类
-                    task_category = TaskCategory.query.filter_by(name=category, is_active=True).first()
+                    task_category = TaskCategory.get_active_by_name(category)
                     if task_category:
                         self.category_id = task_category.id
                         self.category = task_category.name
@@ -516,4 +579,81 @@ class Task(db.Model):
             'creator_name': self.get_creator_display(),
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }
+
+
+@event.listens_for(db.session, 'after_flush')
+def _invalidate_category_cache(session, flush_context):
+    """分类新增、修改或删除后清空分类缓存，并标记在事务结束时再清空一次"""
+    changed = list(session.new) + list(session.dirty) + list(session.deleted)
+    if any(isinstance(obj, TaskCategory) for obj in changed):
+        category_cache.clear()
+        session.info['category_cache_dirty'] = True
+
+
+@event.listens_for(db.session, 'after_commit')
+@event.listens_for(db.session, 'after_rollback')
+def _clear_category_cache_on_end(session):
+    """事务提交或回滚后再次清空，丢弃事务期间读入的未提交分类数据"""
+    if session.info.pop('category_cache_dirty', False):
+        category_cache.clear()
+
+
+class TaskStat(db.Model):
+    """任务统计汇总模型类，按维度保存预先计算好的任务计数（写入任务时增量维护）"""
+    
+    __tablename__ = 'task_stats'  # 指定数据库表名
+    
+    # 统计维度：all（全部任务，仅一行）、category（分类）、creator（创建者）、assignee（负责人）
+    dimension = db.Column(db.String(20), primary_key=True)
+    # 维度取值：all维度为空字符串，其余为分类键、创建者ID或负责人姓名（空值记为空字符串）
+    key = db.Column(db.String(120), primary_key=True)
+    
+    # 各状态任务计数
+    total = db.Column(db.Integer, nullable=False, default=0)  # 任务总数
+    pending = db.Column(db.Integer, nullable=False, default=0)  # 待处理任务数
+    in_progress = db.Column(db.Integer, nullable=False, default=0)  # 进行中任务数
+    completed = db.Column(db.Integer, nullable=False, default=0)  # 已完成任务数
+    
+    def __repr__(self):
+        """返回对象的字符串表示"""
+        return f'<TaskStat {self.dimension}:{self.key} {self.total}>'
+    
+    def to_counts(self):
+        """转换为 {状态: 数量} 字典"""
+        return {
+            'pending': self.pending,
+            'in-progress': self.in_progress,
+            'completed': self.completed
+        }
+
+
+class TaskChange(db.Model):
+    """任务变更日志模型类，由数据库触发器在任务新增、修改、删除时写入（见 change_feed.py）"""
+
+    __tablename__ = 'task_changes'  # 指定数据库表名
+    # 使用AUTOINCREMENT，清理旧日志后序号也不会被重复使用
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    seq = db.Column(db.Integer, primary_key=True)  # 变更序号，单调递增
+    task_id = db.Column(db.Integer, nullable=False)  # 任务ID（任务删除后保留，不设外键）
+    action = db.Column(db.String(20), nullable=False)  # 变更类型：create、update、progress、delete
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # 变更时间
+
+    def __repr__(self):
+        """返回对象的字符串表示"""
+        return f'<TaskChange {self.seq} {self.action} {self.task_id}>'
+
+
+# 已被组合索引取代的旧索引（组合索引的前缀同样支持单列查询）
+SUPERSEDED_INDEXES = ['ix_tasks_creator_id', 'ix_tasks_assignee']
+
+
+def ensure_indexes():
+    """为已存在的数据库补建模型中声明的索引（db.create_all 不会修改已有的表），并删除已被取代的旧索引"""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+    with db.engine.begin() as conn:
+        for name in SUPERSEDED_INDEXES:
+            conn.exec_driver_sql(f'DROP INDEX IF EXISTS {name}')
\ No newline at end of file
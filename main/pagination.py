@@ -0,0 +1,133 @@
+# 分页工具模块 - 基于键集（keyset）的游标分页
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+# 每页默认条数和最大条数
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """
+    解析每页条数参数
+    参数: value - 请求中的limit参数（可能为None或字符串）
+    返回: 1到maximum之间的整数
+    """
+    if value is None or value == '':
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError('limit必须是整数')
+    if limit < 1:
+        raise ValueError('limit必须大于0')
+    return min(limit, maximum)
+
+# 默认排序：按创建时间倒序
+DEFAULT_SORT = '-created_at'
+
+def parse_sort(value, allowed, default=DEFAULT_SORT):
+    """
+    解析排序参数，字段名前加 - 表示倒序（例如 -created_at）
+    参数: value - 请求中的sort参数, allowed - 允许排序的字段名集合
+    返回: 排序字符串
+    """
+    value = value or default
+    field = value[1:] if value.startswith('-') else value
+    if field not in allowed:
+        raise ValueError(f'不支持按 {field} 排序，可选: {", ".join(sorted(allowed))}')
+    return value
+
+def encode_cursor(sort_value, row_id, sort=DEFAULT_SORT):
+    """
+    将排序键编码为不透明的游标字符串
+    参数: sort_value - 排序字段的值（日期、时间或None）, row_id - 记录ID, sort - 排序字符串
+    返回: URL安全的base64字符串
+    """
+    value = sort_value.isoformat() if sort_value is not None else None
+    data = [value, row_id] if sort == DEFAULT_SORT else [value, row_id, sort]
+    payload = json.dumps(data, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, sort=DEFAULT_SORT, value_type=datetime):
+    """
+    解析游标字符串
+    参数: cursor - encode_cursor生成的字符串, sort - 当前请求的排序, value_type - 排序字段的类型（datetime或date）
+    返回: (sort_value, row_id) 元组
+    异常: 游标格式错误或与当前排序不一致时抛出 ValueError
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        value, row_id = data[0], int(data[1])
+        cursor_sort = data[2] if len(data) > 2 else DEFAULT_SORT
+        if cursor_sort != sort:
+            raise ValueError
+        return (value_type.fromisoformat(value) if value is not None else None), row_id
+    except (ValueError, TypeError, UnicodeError, IndexError, KeyError):
+        raise ValueError('分页游标无效')
+
+def _after_cursor(column, id_column, value, row_id, descending, nullable):
+    """
+    排在游标 (value, row_id) 之后的记录条件
+    SQLite中NULL最小：升序时排在最前，倒序时排在最后；非空列不加NULL条件，以便使用索引
+    """
+    if descending:
+        if value is None:
+            return and_(column.is_(None), id_column < row_id)
+        after = or_(column < value, and_(column == value, id_column < row_id))
+        return or_(after, column.is_(None)) if nullable else after
+    if value is None:
+        return or_(column.isnot(None), and_(column.is_(None), id_column > row_id))
+    return or_(column > value, and_(column == value, id_column > row_id))
+
+def sort_order(model, sort=DEFAULT_SORT):
+    """排序字符串对应的 ORDER BY 子句（以id作为第二排序键，保证顺序稳定）"""
+    column = getattr(model, sort.lstrip('-'))
+    if sort.startswith('-'):
+        return [column.desc(), model.id.desc()]
+    return [column.asc(), model.id.asc()]
+
+def keyset_window(query, model, limit, cursor=None, sort=DEFAULT_SORT):
+    """
+    为查询加上游标条件、排序和条数限制（多取一条用于判断是否还有下一页）
+    query 可以是ORM查询，也可以是 select() 语句（异步会话执行后交给 keyset_page）
+    """
+    descending = sort.startswith('-')
+    field = sort.lstrip('-')
+    column = getattr(model, field)
+
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort, column.type.python_type)
+        # 只取排在游标之后的记录，借助索引直接定位，不受偏移量影响
+        nullable = model.__table__.c[field].nullable
+        query = query.filter(_after_cursor(column, model.id, value, row_id, descending, nullable))
+
+    return query.order_by(*sort_order(model, sort)).limit(limit + 1)
+
+def keyset_page(rows, limit, sort=DEFAULT_SORT):
+    """
+    根据 keyset_window 查询结果截取当前页
+    返回: (当前页记录列表, 下一页游标或None)
+    """
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort.lstrip('-')), last.id, sort)
+    return rows, next_cursor
+
+def keyset_paginate(query, model, limit, cursor=None, sort=DEFAULT_SORT):
+    """
+    按 (排序字段, id) 进行键集分页
+    参数:
+        query - 已应用筛选条件的查询对象，结果行需包含排序字段和id
+        model - 含排序字段和id字段的模型类
+        limit - 每页条数
+        cursor - 上一页返回的游标（首页为None）
+        sort - 排序字符串，字段名前加 - 表示倒序，默认按创建时间倒序
+    返回: (当前页记录列表, 下一页游标或None)
+    """
+    rows = keyset_window(query, model, limit, cursor, sort).all()
+    return keyset_page(rows, limit, sort)
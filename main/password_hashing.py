@@ -0,0 +1,93 @@
+# 密码哈希模块 - 在有界线程池中执行密码哈希，限制同时占用CPU的哈希计算数量
+# hashlib 的 pbkdf2/scrypt 计算会释放GIL，线程池可以真正并行执行
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash, check_password_hash
+
+# 默认哈希算法和参数（Werkzeug格式，例如 pbkdf2:sha256:600000 或 scrypt:32768:8:1）
+DEFAULT_METHOD = 'pbkdf2:sha256:600000'
+# 默认工作线程数和最大排队数
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 64
+# 等待排队名额的最长秒数
+ACQUIRE_TIMEOUT = 10
+
+def method_prefix(method):
+    """
+    补全默认参数后的方法前缀（与Werkzeug写入哈希开头的部分相同），用于判断旧哈希是否需要升级
+    直接按Werkzeug的默认参数补全，不需要实际计算一次哈希
+    例如: pbkdf2 -> pbkdf2:sha256:600000, scrypt -> scrypt:32768:8:1
+    """
+    name, *args = method.split(':')
+    if name == 'pbkdf2':
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+    if name == 'scrypt':
+        n, r, p = map(int, args) if args else (2 ** 15, 8, 1)
+        return f'scrypt:{n}:{r}:{p}'
+    return method
+
+class PasswordHasherBusy(RuntimeError):
+    """哈希线程池排队已满，在超时时间内无法提交新的哈希任务"""
+
+class PasswordHasher:
+    """
+    有界密码哈希线程池
+    参数:
+        method - Werkzeug哈希方法字符串
+        workers - 并行执行哈希的线程数
+        max_pending - 正在执行和排队的哈希任务总数上限
+    """
+
+    def __init__(self, method=DEFAULT_METHOD, workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING):
+        self.method = method
+        self.method_prefix = method_prefix(method)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def _run(self, func, *args):
+        """在线程池中执行哈希函数并等待结果"""
+        if not self._slots.acquire(timeout=ACQUIRE_TIMEOUT):
+            raise PasswordHasherBusy('密码校验请求过多，请稍后重试')
+        try:
+            return self._executor.submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        """生成密码哈希"""
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        """校验密码"""
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """判断已存储的哈希是否使用了与当前配置不同的算法或参数"""
+        return password_hash.split('$', 1)[0] != self.method_prefix
+
+    def shutdown(self):
+        """关闭线程池"""
+        self._executor.shutdown(wait=True)
+
+# 全局哈希线程池，create_app 根据配置重新创建
+_hasher = None
+_hasher_lock = threading.RLock()
+
+def configure_password_hashing(method=DEFAULT_METHOD, workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING):
+    """按配置创建全局哈希线程池"""
+    global _hasher
+    with _hasher_lock:
+        old, _hasher = _hasher, PasswordHasher(method, workers, max_pending)
+    if old is not None:
+        old.shutdown()
+    return _hasher
+
+def get_password_hasher():
+    """获取全局哈希线程池，未配置时使用默认参数创建"""
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                return configure_password_hashing()
+    return _hasher
@@ -0,0 +1,119 @@
+# 进度写入缓冲模块 - 高频进度更新先进入内存缓冲，同一任务在写入窗口内的多次更新合并为一次，
+# 窗口到期后在一个事务中批量写入（write-behind）；进程异常退出时尚未写入的更新会丢失
+import atexit
+import logging
+import threading
+from models import db
+from progress_service import status_for_progress, load_progress_targets, apply_progress_updates
+
+logger = logging.getLogger(__name__)
+
+# 写入模式：immediate - 每次更新立即提交（默认）；buffered - 进入缓冲后立即返回，按窗口批量提交
+WRITE_MODES = ('immediate', 'buffered')
+
+class ProgressWriteBuffer:
+    """
+    进度更新的合并写入缓冲
+    参数:
+        flush_seconds - 缓冲收到第一条更新后等待多久写入
+        max_pending - 缓冲中的任务数达到该值时立即写入
+    写入按批次顺序执行，同一任务较新的进度不会被较早的批次覆盖
+    """
+
+    def __init__(self, flush_seconds=0.5, max_pending=500):
+        self.app = None
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._pending = {}  # 任务ID -> [最新进度, 合并的更新数]
+        self._timer = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stats = {'received': 0, 'flushed_updates': 0, 'rows_written': 0, 'commits': 0, 'failed_updates': 0}
+
+    def submit(self, task_id, progress):
+        """
+        加入缓冲（进度已校验），同一任务只保留最新的进度
+        返回: 是否与尚未写入的更新合并
+        """
+        with self._lock:
+            self._stats['received'] += 1
+            entry = self._pending.get(task_id)
+            if entry is None:
+                self._pending[task_id] = [progress, 1]
+            else:
+                entry[0] = progress
+                entry[1] += 1
+            flush_now = len(self._pending) >= self.max_pending
+            if not flush_now and self._timer is None:
+                self._timer = threading.Timer(self.flush_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if flush_now:
+            self.flush()
+        return entry is not None
+
+    def flush(self):
+        """
+        把缓冲中的更新在一个事务中写入（复用批量更新进度的集合式UPDATE），已删除的任务跳过
+        返回: 写入的任务数
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not pending:
+                return 0
+
+            updates = {task_id: entry[0] for task_id, entry in pending.items()}
+            merged = sum(entry[1] for entry in pending.values())
+            with self.app.app_context():
+                try:
+                    targets = load_progress_targets(list(updates))
+                    updates = {task_id: progress for task_id, progress in updates.items() if task_id in targets}
+                    apply_progress_updates(updates, targets)
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    logger.exception('写入缓冲的进度更新失败，丢弃 %d 条更新', merged)
+                    with self._lock:
+                        self._stats['failed_updates'] += merged
+                    return 0
+
+            with self._lock:
+                self._stats['flushed_updates'] += merged
+                self._stats['rows_written'] += len(updates)
+                self._stats['commits'] += 1
+            return len(updates)
+
+    def metrics(self):
+        """
+        写入统计：收到的更新数、已写入的更新数、写入的行数、提交次数、失败数、缓冲中的任务数，
+        以及节省的提交次数（立即提交模式下已写入的每条更新都要一次提交）
+        """
+        with self._lock:
+            metrics = dict(self._stats, pending=len(self._pending))
+        metrics['commits_saved'] = metrics['flushed_updates'] - metrics['commits']
+        return metrics
+
+def accepted_progress(task_id, progress, current_status):
+    """进入缓冲后返回给客户端的结果（202），状态按写入后的规则推算"""
+    return {
+        'task': {'id': task_id, 'progress': progress, 'status': status_for_progress(progress, current_status)},
+        'buffered': True
+    }
+
+# 全局进度写入缓冲，create_app 根据配置设置参数
+progress_buffer = ProgressWriteBuffer()
+
+def init_progress_buffer(app):
+    """按配置设置写入窗口；buffered 模式下进程正常退出前写入缓冲中剩余的更新"""
+    mode = app.config['PROGRESS_WRITE_MODE']
+    if mode not in WRITE_MODES:
+        raise ValueError(f'PROGRESS_WRITE_MODE 只能是: {", ".join(WRITE_MODES)}')
+    progress_buffer.app = app
+    progress_buffer.flush_seconds = app.config['PROGRESS_FLUSH_SECONDS']
+    progress_buffer.max_pending = app.config['PROGRESS_BUFFER_MAX_PENDING']
+    if mode == 'buffered':
+        atexit.register(progress_buffer.flush)
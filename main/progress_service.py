@@ -0,0 +1,68 @@
+# 任务进度批量更新模块 - 用一条集合式UPDATE完成多个任务的进度和状态更新
+from datetime import datetime
+from sqlalchemy import case
+from models import db, Task
+from stats_service import TRACKED_FIELDS, apply_changed_rows
+
+def status_for_progress(progress, current_status):
+    """根据进度自动推导状态：100为已完成，大于0为进行中，0保持原状态"""
+    if progress == 100:
+        return 'completed'
+    if progress > 0:
+        return 'in-progress'
+    return current_status
+
+def validate_progress(progress):
+    """校验进度值（规则与 Task.update_task 一致）"""
+    if isinstance(progress, bool) or not isinstance(progress, int) or progress < 0 or progress > 100:
+        raise ValueError("进度必须是0-100之间的整数")
+
+def load_progress_targets(task_ids):
+    """
+    一次查询取出待更新任务的权限检查和统计所需字段
+    返回: {任务ID: 行对象}，行对象包含 id 和 TRACKED_FIELDS 中的字段
+    """
+    columns = [Task.id] + [getattr(Task, field) for field in TRACKED_FIELDS]
+    rows = db.session.query(*columns).filter(Task.id.in_(task_ids)).all()
+    return {row.id: row for row in rows}
+
+def apply_progress_updates(updates, targets):
+    """
+    使用一条 UPDATE ... CASE 语句批量更新进度和状态，并同步统计表（不提交事务）
+    参数:
+        updates - {任务ID: 新进度}，进度已校验
+        targets - load_progress_targets 返回的行对象
+    返回: [{'id', 'progress', 'status'}] 更新后的结果列表
+    """
+    if not updates:
+        return []
+
+    now = datetime.utcnow()
+    progress_case = case(updates, value=Task.id)
+    status_case = case(
+        (progress_case == 100, 'completed'),
+        (progress_case > 0, 'in-progress'),
+        else_=Task.status
+    )
+    db.session.execute(
+        Task.__table__.update()
+        .where(Task.id.in_(list(updates)))
+        .values(progress=progress_case, status=status_case, updated_at=now)
+    )
+
+    # 集合式UPDATE不经过ORM刷新事件，手动更新统计表中状态计数
+    results, changes = [], []
+    for task_id, progress in updates.items():
+        before = targets[task_id]._asdict()
+        after = dict(before, status=status_for_progress(progress, before['status']))
+        changes.append((before, after))
+        results.append({'id': task_id, 'progress': progress, 'status': after['status']})
+    apply_changed_rows(db.session.connection(), changes)
+
+    # 会话中可能已加载这些任务，标记过期以便后续读取到新值
+    for task_id in updates:
+        task = db.session.identity_map.get(db.session.identity_key(Task, task_id))
+        if task is not None:
+            db.session.expire(task)
+
+    return results
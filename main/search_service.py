@@ -0,0 +1,114 @@
+# 任务全文搜索模块 - 基于SQLite FTS5的外部内容索引，由触发器与任务表保持同步
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from models import db, Task
+
+# trigram分词器按3个字符切分，既支持中文也支持子串匹配；更短的词退回到LIKE匹配
+MIN_FTS_TERM_LENGTH = 3
+
+# 排序权重：标题、描述、负责人（bm25数值越小越相关）
+RANK_EXPRESSION = 'bm25(tasks_fts, 10.0, 1.0, 5.0)'
+
+SEARCH_INDEX_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description, assignee,
+        content='tasks', content_rowid='id', tokenize='trigram'
+    )""",
+    # 新增任务时写入索引
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description, assignee)
+        VALUES (new.id, new.title, new.description, new.assignee);
+    END""",
+    # 删除任务时移除索引
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description, assignee)
+        VALUES ('delete', old.id, old.title, old.description, old.assignee);
+    END""",
+    # 仅在可搜索字段变化时更新索引，进度和状态更新不受影响
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description, assignee ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description, assignee)
+        VALUES ('delete', old.id, old.title, old.description, old.assignee);
+        INSERT INTO tasks_fts(rowid, title, description, assignee)
+        VALUES (new.id, new.title, new.description, new.assignee);
+    END""",
+]
+
+def ensure_search_index():
+    """
+    创建全文索引表和同步触发器，新建索引表时根据任务表全量填充
+    返回: FTS5是否可用
+    """
+    with db.engine.begin() as conn:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+        )).first() is not None
+        try:
+            for statement in SEARCH_INDEX_DDL:
+                conn.execute(text(statement))
+        except OperationalError:
+            # SQLite未编译FTS5或不支持trigram分词器时退回到LIKE搜索
+            return False
+        if not exists:
+            conn.execute(text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+    return True
+
+def search_index_exists():
+    """全文索引表是否存在（由 flask init-db 创建，不存在时搜索退回到LIKE匹配）"""
+    with db.engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+        )).first() is not None
+
+def _fts_phrase(term):
+    """把搜索词转换为FTS5短语（双引号转义），避免用户输入被解析为查询语法"""
+    return '"' + term.replace('"', '""') + '"'
+
+def _like_pattern(term):
+    """把搜索词转换为LIKE子串模式，转义通配符"""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+def search_task_ids(query, limit, offset=0, fts_enabled=True):
+    """
+    搜索任务标题、描述和负责人，按相关度排序
+    参数:
+        query - 搜索字符串，按空白分词，所有词都需匹配
+        limit, offset - 分页参数
+        fts_enabled - FTS5是否可用
+    返回: 任务ID列表（最多limit条）
+    """
+    terms = [term for term in query.split() if term]
+    if not terms:
+        return []
+
+    fts_terms = [t for t in terms if len(t) >= MIN_FTS_TERM_LENGTH] if fts_enabled else []
+    like_terms = [t for t in terms if t not in fts_terms]
+
+    params = {'limit': limit, 'offset': offset}
+    conditions = []
+    for i, term in enumerate(like_terms):
+        params[f'like{i}'] = _like_pattern(term)
+        conditions.append(
+            f"(tasks.title LIKE :like{i} ESCAPE '\\' OR tasks.description LIKE :like{i} ESCAPE '\\' "
+            f"OR tasks.assignee LIKE :like{i} ESCAPE '\\')"
+        )
+
+    if fts_terms:
+        # 长词走全文索引并按bm25排序，短词作为附加过滤条件
+        params['match'] = ' AND '.join(_fts_phrase(t) for t in fts_terms)
+        where = ' AND '.join(['tasks_fts MATCH :match'] + conditions)
+        sql = (f'SELECT tasks.id FROM tasks_fts JOIN tasks ON tasks.id = tasks_fts.rowid '
+               f'WHERE {where} ORDER BY {RANK_EXPRESSION}, tasks.id DESC LIMIT :limit OFFSET :offset')
+    else:
+        # 只有短词时无法使用trigram索引，按创建时间倒序返回匹配结果
+        sql = (f'SELECT tasks.id FROM tasks WHERE {" AND ".join(conditions)} '
+               f'ORDER BY tasks.created_at DESC, tasks.id DESC LIMIT :limit OFFSET :offset')
+
+    return [row[0] for row in db.session.execute(text(sql), params)]
+
+def load_tasks_in_order(task_ids):
+    """按给定ID顺序加载任务（预加载分类和创建者）"""
+    if not task_ids:
+        return []
+    tasks = {task.id: task for task in Task.query_with_relations().filter(Task.id.in_(task_ids)).all()}
+    return [tasks[task_id] for task_id in task_ids if task_id in tasks]
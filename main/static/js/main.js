@@ -246,20 +246,27 @@ function confirmAction(message, callback) {
 const API = {
     // Base API call function
     async call(url, options = {}) {
+        return (await this.callWithEtag(url, options)).data;
+    },
+    
+    // API call that also returns the response ETag (used as If-Match for optimistic concurrency)
+    async callWithEtag(url, options = {}) {
         try {
             const response = await fetch(url, {
+                ...options,
                 headers: {
                     'Content-Type': 'application/json',
                     ...options.headers
-                },
-                ...options
+                }
             });
             
             if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
+                const error = new Error(`HTTP error! status: ${response.status}`);
+                error.status = response.status; // 412: the task was changed by someone else
+                throw error;
             }
             
-            return await response.json();
+            return { data: await response.json(), etag: response.headers.get('ETag') };
         } catch (error) {
             console.error('API call failed:', error);
             showNotification('发生错误，请稍后重试。', 'danger');
@@ -267,15 +274,33 @@ const API = {
         }
     },
     
-    // Get all tasks
-    async getTasks(status = null) {
-        const url = status ? `/api/tasks?status=${status}` : '/api/tasks';
-        return await this.call(url);
+    // Get one page of tasks (keyset pagination)
+    async getTasks(status = null, cursor = null, limit = null, fields = null) {
+        const params = new URLSearchParams();
+        if (status) params.set('status', status);
+        if (cursor) params.set('cursor', cursor);
+        if (limit) params.set('limit', limit);
+        if (fields) params.set('fields', fields.join(','));
+        const query = params.toString();
+        return await this.call(query ? `/api/tasks?${query}` : '/api/tasks');
+    },
+
+    // Lazily iterate over all tasks, fetching the next page only when needed
+    async *iterTasks(status = null, limit = null) {
+        let cursor = null;
+        do {
+            const page = await this.getTasks(status, cursor, limit);
+            for (const task of page.tasks) {
+                yield task;
+            }
+            cursor = page.next_cursor;
+        } while (cursor);
     },
     
-    // Get single task
+    // Get single task; resolves to { task, etag }
     async getTask(id) {
-        return await this.call(`/api/tasks/${id}`);
+        const { data, etag } = await this.callWithEtag(`/api/tasks/${id}`);
+        return { ...data, etag };
     },
     
     // Create task
@@ -286,12 +311,15 @@ const API = {
         });
     },
     
-    // Update task
-    async updateTask(id, updates) {
-        return await this.call(`/api/tasks/${id}`, {
+    // Update task (pass the ETag from getTask to reject the update with 412 if someone else changed the task);
+    // resolves to { task, etag } with the new ETag for the next update
+    async updateTask(id, updates, etag = null) {
+        const { data, etag: newEtag } = await this.callWithEtag(`/api/tasks/${id}`, {
             method: 'PUT',
+            headers: etag ? { 'If-Match': etag } : {},
             body: JSON.stringify(updates)
         });
+        return { ...data, etag: newEtag };
     },
     
     // Update task progress
@@ -312,6 +340,15 @@ const API = {
     // Get statistics
     async getStats() {
         return await this.call('/api/stats');
+    },
+
+    // Subscribe to task change events instead of polling; EventSource resumes with Last-Event-ID after reconnects
+    subscribeTaskChanges(onChange) {
+        const source = new EventSource('/api/tasks/stream');
+        ['create', 'update', 'progress', 'delete'].forEach(action => {
+            source.addEventListener(action, event => onChange(JSON.parse(event.data)));
+        });
+        return source;
     }
 };
 
@@ -0,0 +1,243 @@
+# 任务统计服务模块 - 写入任务时增量维护统计表（task_stats），读取统计时只查询统计表，不扫描任务表
+from sqlalchemy import Integer, and_, case, cast, event, func, inspect, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import db, Task, TaskCategory, TaskStat, User
+
+def build_stats(counts):
+    """
+    根据各状态任务数组织统计结果
+    参数: counts - {状态: 数量} 字典
+    返回: 与原 /api/stats 字段一致的统计字典
+    """
+    total_tasks = sum(counts.values())
+    completed_tasks = counts.get('completed', 0)
+
+    # 计算完成率
+    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+
+    return {
+        'total_tasks': total_tasks,
+        'completed_tasks': completed_tasks,
+        'in_progress_tasks': counts.get('in-progress', 0),
+        'pending_tasks': counts.get('pending', 0),
+        'completion_rate': round(completion_rate, 1)
+    }
+
+# ========== 统计汇总表（task_stats）增量维护 ==========
+
+# 任务状态与统计表计数字段的对应关系
+STATUS_COLUMNS = {
+    'pending': 'pending',
+    'in-progress': 'in_progress',
+    'completed': 'completed'
+}
+
+def _category_key(category_id, category):
+    """分类维度的键：动态分类使用分类ID，未关联动态分类的旧数据使用 legacy:分类名"""
+    if category_id:
+        return str(category_id)
+    return f'legacy:{category}' if category else ''
+
+def _stat_keys(status, category_id, category, creator_id, assignee):
+    """返回一条任务在各统计维度下对应的 (维度, 键) 列表"""
+    return [
+        ('all', ''),
+        ('category', _category_key(category_id, category)),
+        ('creator', str(creator_id) if creator_id else ''),
+        ('assignee', assignee or '')
+    ]
+
+def _add_delta(deltas, values, sign):
+    """把一条任务的计数变化（+1或-1）累加到各维度"""
+    status = values[0]
+    for stat_key in _stat_keys(*values):
+        delta = deltas.setdefault(stat_key, {'total': 0, 'pending': 0, 'in_progress': 0, 'completed': 0})
+        delta['total'] += sign
+        if status in STATUS_COLUMNS:
+            delta[STATUS_COLUMNS[status]] += sign
+
+# 影响统计结果的任务字段
+TRACKED_FIELDS = ['status', 'category_id', 'category', 'creator_id', 'assignee']
+
+def _current_values(task):
+    """任务当前（刷新后）的统计字段值"""
+    return tuple(getattr(task, field) for field in TRACKED_FIELDS)
+
+def _previous_values(task):
+    """任务修改前的统计字段值（从属性历史中获取）"""
+    state = inspect(task)
+    values = []
+    for field in TRACKED_FIELDS:
+        history = state.attrs[field].history
+        if history.deleted:
+            values.append(history.deleted[0])
+        elif history.unchanged:
+            values.append(history.unchanged[0])
+        else:
+            values.append(getattr(task, field))
+    return tuple(values)
+
+def _has_tracked_changes(task):
+    """检查任务是否修改了影响统计结果的字段"""
+    state = inspect(task)
+    return any(state.attrs[field].history.has_changes() for field in TRACKED_FIELDS)
+
+def apply_stat_deltas(connection, deltas):
+    """
+    将计数变化以 UPSERT 方式累加到统计表
+    参数: connection - 当前事务的数据库连接, deltas - {(维度, 键): {字段: 变化量}}
+    """
+    for (dimension, key), delta in deltas.items():
+        if not any(delta.values()):
+            continue
+        stmt = sqlite_insert(TaskStat.__table__).values(dimension=dimension, key=key, **delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['dimension', 'key'],
+            set_={column: getattr(TaskStat.__table__.c, column) + amount for column, amount in delta.items()}
+        )
+        connection.execute(stmt)
+
+def apply_inserted_rows(connection, rows):
+    """为绕过ORM批量插入的任务行（列名到值的字典）累加统计计数"""
+    deltas = {}
+    for row in rows:
+        _add_delta(deltas, tuple(row.get(field) for field in TRACKED_FIELDS), 1)
+    apply_stat_deltas(connection, deltas)
+
+def apply_changed_rows(connection, changes):
+    """
+    为绕过ORM执行的批量UPDATE累加统计计数
+    参数: changes - [(修改前字段字典, 修改后字段字典)]，字段见 TRACKED_FIELDS
+    """
+    deltas = {}
+    for before, after in changes:
+        _add_delta(deltas, tuple(before.get(field) for field in TRACKED_FIELDS), -1)
+        _add_delta(deltas, tuple(after.get(field) for field in TRACKED_FIELDS), 1)
+    apply_stat_deltas(connection, deltas)
+
+def _update_task_stats(session, flush_context):
+    """会话刷新后根据新增、修改、删除的任务增量更新统计表"""
+    deltas = {}
+
+    for obj in session.new:
+        if isinstance(obj, Task):
+            _add_delta(deltas, _current_values(obj), 1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Task) and _has_tracked_changes(obj):
+            _add_delta(deltas, _previous_values(obj), -1)
+            _add_delta(deltas, _current_values(obj), 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            _add_delta(deltas, _previous_values(obj), -1)
+
+    if deltas:
+        apply_stat_deltas(session.connection(), deltas)
+
+def track_task_stats(session_target):
+    """在会话上注册统计表增量维护（异步接口的会话类也通过它注册）"""
+    event.listen(session_target, 'after_flush', _update_task_stats)
+
+track_task_stats(db.session)
+
+def rebuild_task_stats():
+    """根据任务表全量重新计算统计表（用于初始化或修复计数）"""
+    TaskStat.query.delete()
+
+    status_columns = [func.sum(case((Task.status == status, 1), else_=0)) for status in STATUS_COLUMNS]
+    dimensions = [
+        ('category', [Task.category_id, Task.category], lambda row: _category_key(row[0], row[1])),
+        ('creator', [Task.creator_id], lambda row: str(row[0]) if row[0] else ''),
+        ('assignee', [Task.assignee], lambda row: row[0] or '')
+    ]
+
+    # 全部任务汇总行（即使没有任务也写入，保证读取时始终存在）
+    totals = db.session.query(func.count(Task.id), *status_columns).one()
+    stats = [TaskStat(dimension='all', key='', total=totals[0],
+                      pending=totals[1] or 0, in_progress=totals[2] or 0, completed=totals[3] or 0)]
+
+    for dimension, columns, make_key in dimensions:
+        rows = db.session.query(*columns, func.count(Task.id), *status_columns).group_by(*columns).all()
+        merged = {}
+        for row in rows:
+            key = make_key(row)
+            counts = merged.setdefault(key, [0, 0, 0, 0])
+            for i, value in enumerate(row[len(columns):]):
+                counts[i] += value or 0
+        for key, (total, pending, in_progress, completed) in merged.items():
+            stats.append(TaskStat(dimension=dimension, key=key, total=total,
+                                  pending=pending, in_progress=in_progress, completed=completed))
+
+    db.session.add_all(stats)
+    db.session.commit()
+    return stats[0]
+
+# 全部任务汇总行的主键
+STATS_SUMMARY_KEY = ('all', '')
+
+# 分组统计每个维度默认和最多返回的行数（负责人是自由文本，行数随数据增长）
+DEFAULT_BREAKDOWN_SIZE = 20
+MAX_BREAKDOWN_SIZE = 200
+
+def summary_stats(row):
+    """把统计表的全部任务汇总行（可能为None）转换为总体统计数据"""
+    return build_stats(row.to_counts() if row else {})
+
+def get_task_stats():
+    """读取统计表中的全部任务汇总行（单行主键查询），返回总体统计数据"""
+    return summary_stats(db.session.get(TaskStat, STATS_SUMMARY_KEY))
+
+def stat_breakdowns_select(limit):
+    """
+    分组统计查询：从统计表取出按分类、创建者、负责人每个维度任务数最多的前limit行，
+    同时连接分类名称和创建者姓名，一条语句完成
+    返回: select() 语句，结果交给 build_stats_breakdowns 转换
+    """
+    rank = func.row_number().over(partition_by=TaskStat.dimension, order_by=(TaskStat.total.desc(), TaskStat.key))
+    ranked = select(TaskStat.dimension, TaskStat.key, TaskStat.total, TaskStat.completed, rank.label('rank')) \
+        .where(TaskStat.dimension != 'all', TaskStat.total > 0).subquery()
+    # 键转换为整数后按主键连接；legacy:分类名 和空键转换为0，不会匹配
+    key_id = cast(ranked.c.key, Integer)
+    return select(
+        ranked.c.dimension, ranked.c.key, ranked.c.total, ranked.c.completed,
+        TaskCategory.id, TaskCategory.name, TaskCategory.display_name, User.full_name
+    ).outerjoin(TaskCategory, and_(ranked.c.dimension == 'category', TaskCategory.id == key_id)) \
+     .outerjoin(User, and_(ranked.c.dimension == 'creator', User.id == key_id)) \
+     .where(ranked.c.rank <= limit) \
+     .order_by(ranked.c.dimension, ranked.c.rank)
+
+def get_stats_breakdowns(limit=DEFAULT_BREAKDOWN_SIZE):
+    """从统计表读取按分类、创建者、负责人的分组统计（每个维度最多limit行）"""
+    return build_stats_breakdowns(db.session.execute(stat_breakdowns_select(limit)).all())
+
+def build_stats_breakdowns(rows):
+    """
+    把分组统计查询的结果转换为接口输出格式
+    参数: rows - stat_breakdowns_select 的结果行
+    """
+    breakdowns = {'by_category': [], 'by_creator': [], 'by_assignee': []}
+    for dimension, key, total, completed, category_id, category_name, display_name, creator_name in rows:
+        if dimension == 'category':
+            legacy_name = key[len('legacy:'):] if key.startswith('legacy:') else None
+            breakdowns['by_category'].append({
+                'category_id': category_id,
+                'name': category_name if category_id else legacy_name,
+                'display_name': display_name if category_id else (legacy_name or '未分类'),
+                'total_tasks': total,
+                'completed_tasks': completed
+            })
+        elif dimension == 'creator':
+            breakdowns['by_creator'].append({
+                'creator_id': int(key) if key else None,
+                'creator_name': creator_name or '系统',
+                'total_tasks': total,
+                'completed_tasks': completed
+            })
+        elif dimension == 'assignee':
+            breakdowns['by_assignee'].append({
+                'assignee': key or None,
+                'total_tasks': total,
+                'completed_tasks': completed
+            })
+    return breakdowns
@@ -0,0 +1,45 @@
+# 任务导出模块 - 逐行流式生成NDJSON/CSV，内存占用与任务总数无关
+import csv
+import io
+import json
+from models import Task
+from task_serialization import TASK_FIELDS, task_rows_query, row_to_dict
+
+# 每次从数据库游标读取的行数
+EXPORT_BATCH_SIZE = 1000
+
+# 导出字段（与 Task.to_dict 保持一致）
+EXPORT_FIELDS = TASK_FIELDS
+
+def iter_export_rows(status=None):
+    """
+    按ID顺序分批读取任务，只查询导出需要的列并在同一查询中关联创建者姓名
+    参数: status - 可选的状态筛选
+    返回: 任务字典生成器
+    """
+    query = task_rows_query()
+    if status:
+        query = query.filter(Task.status == status)
+
+    for row in query.order_by(Task.id).yield_per(EXPORT_BATCH_SIZE):
+        yield row_to_dict(row)
+
+def generate_ndjson(rows):
+    """把任务字典逐行编码为NDJSON"""
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+def generate_csv(rows):
+    """把任务字典逐行编码为CSV（首行为表头）"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        # 每写一行就输出并清空缓冲区，保持内存占用恒定
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # 没有任何任务时也要输出表头
+    if buffer.tell():
+        yield buffer.getvalue()
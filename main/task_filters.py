@@ -0,0 +1,155 @@
+# 任务筛选模块 - 解析筛选和排序参数，在数据库中完成筛选，并计算分面计数
+# （只有状态和分类筛选时从统计表读取，否则用一条分组查询）
+from datetime import date
+from sqlalchemy import func, select, cast, String
+from models import db, Task, TaskCategory, TaskStat
+
+STATUSES = ['pending', 'in-progress', 'completed']
+
+# 允许排序的字段（都有索引）
+SORT_FIELDS = {'created_at', 'updated_at', 'planned_start_date', 'planned_end_date'}
+
+# 日期范围参数：参数名 -> (列, 比较方式)
+DATE_RANGE_PARAMS = {
+    'planned_start_from': (Task.planned_start_date, 'ge'),
+    'planned_start_to': (Task.planned_start_date, 'le'),
+    'planned_end_from': (Task.planned_end_date, 'ge'),
+    'planned_end_to': (Task.planned_end_date, 'le'),
+}
+
+# 筛选参数名（用于在页面链接中保留当前筛选条件）
+FILTER_PARAMS = ['status', 'category_id', 'assignee', 'creator_id',
+                 'progress_min', 'progress_max'] + list(DATE_RANGE_PARAMS)
+
+def _parse_int(value, name, minimum=None, maximum=None):
+    """解析整数参数"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f'{name}必须是整数')
+    if (minimum is not None and number < minimum) or (maximum is not None and number > maximum):
+        raise ValueError(f'{name}必须在{minimum}到{maximum}之间')
+    return number
+
+def parse_task_filters(args):
+    """
+    从请求参数中解析任务筛选条件，空值和 status=all 视为不筛选
+    参数: args - request.args
+    返回: {参数名: 解析后的值}
+    异常: 参数不合法时抛出 ValueError
+    """
+    filters = {}
+    for name in FILTER_PARAMS:
+        value = args.get(name, '').strip()
+        if value and not (name == 'status' and value == 'all'):
+            filters[name] = value
+
+    if 'status' in filters and filters['status'] not in STATUSES:
+        raise ValueError(f'状态只能是: {", ".join(STATUSES)}')
+    for name in ('category_id', 'creator_id'):
+        if name in filters:
+            filters[name] = _parse_int(filters[name], name)
+    for name in ('progress_min', 'progress_max'):
+        if name in filters:
+            filters[name] = _parse_int(filters[name], name, 0, 100)
+    for name in DATE_RANGE_PARAMS:
+        if name in filters:
+            try:
+                filters[name] = date.fromisoformat(filters[name])
+            except ValueError:
+                raise ValueError(f'{name}必须是YYYY-MM-DD格式的日期')
+    return filters
+
+def apply_task_filters(query, filters, exclude=()):
+    """
+    把筛选条件应用到任务查询
+    参数:
+        query - 任务查询（ORM或列查询）
+        filters - parse_task_filters 的结果
+        exclude - 不应用的筛选参数名（计算分面时使用）
+    """
+    conditions = []
+    if 'status' in filters and 'status' not in exclude:
+        conditions.append(Task.status == filters['status'])
+    if 'category_id' in filters and 'category_id' not in exclude:
+        conditions.append(Task.category_id == filters['category_id'])
+    if 'assignee' in filters:
+        conditions.append(Task.assignee == filters['assignee'])
+    if 'creator_id' in filters:
+        conditions.append(Task.creator_id == filters['creator_id'])
+    if 'progress_min' in filters:
+        conditions.append(Task.progress >= filters['progress_min'])
+    if 'progress_max' in filters:
+        conditions.append(Task.progress <= filters['progress_max'])
+    for name, (column, op) in DATE_RANGE_PARAMS.items():
+        if name in filters:
+            conditions.append(column >= filters[name] if op == 'ge' else column <= filters[name])
+    return query.filter(*conditions) if conditions else query
+
+def parse_facets_flag(args):
+    """分面计数需要显式请求（facets=1），大表上按筛选条件分组计数的代价远高于分页查询本身"""
+    return args.get('facets', '').strip().lower() in ('1', 'true')
+
+def uses_stat_facets(filters):
+    """分面计数排除状态和分类筛选，没有其他筛选条件时可以直接从统计表读取"""
+    return not (set(filters) - {'status', 'category_id'})
+
+def stat_facets_select():
+    """
+    从统计表读取各分类的状态计数（代替扫描任务表的分组查询）
+    返回: select() 语句，结果交给 stat_facet_rows 转换
+    """
+    return select(
+        TaskStat.key, TaskCategory.display_name, TaskStat.pending, TaskStat.in_progress, TaskStat.completed
+    ).outerjoin(TaskCategory, TaskStat.key == cast(TaskCategory.id, String)) \
+     .where(TaskStat.dimension == 'category', TaskStat.total > 0)
+
+def stat_facet_rows(rows):
+    """把统计表的分类计数转换成与 task_facets_select 相同的 (状态, 分类ID, 分类名, 数量) 行"""
+    for key, display_name, pending, in_progress, completed in rows:
+        # 未关联动态分类的旧数据（legacy:分类名）和未分类任务都归入分类ID为空的一组
+        category_id = int(key) if key.isdigit() else None
+        for status, count in (('pending', pending), ('in-progress', in_progress), ('completed', completed)):
+            if count:
+                yield status, category_id, display_name if category_id else None, count
+
+def task_facets_select(filters):
+    """
+    分面计数查询：按 (状态, 分类) 分组，应用除状态和分类外的所有筛选条件
+    返回: select() 语句，结果交给 summarize_task_facets 汇总
+    """
+    stmt = select(
+        Task.status, Task.category_id, TaskCategory.display_name, func.count(Task.id)
+    ).outerjoin(TaskCategory, Task.category_id == TaskCategory.id)
+    stmt = apply_task_filters(stmt, filters, exclude=('status', 'category_id'))
+    return stmt.group_by(Task.status, Task.category_id, TaskCategory.display_name)
+
+def summarize_task_facets(rows, filters):
+    """
+    汇总分面计数：状态分面再按当前分类筛选汇总，分类分面再按当前状态筛选汇总，
+    这样每个分面显示的是切换到该选项后的结果数
+    返回: {'status': {状态: 数量}, 'category': [{'category_id', 'display_name', 'count'}]}
+    """
+    status_counts = {status: 0 for status in STATUSES}
+    category_counts = {}
+    for status, category_id, display_name, count in rows:
+        if filters.get('category_id') in (None, category_id):
+            status_counts[status] = status_counts.get(status, 0) + count
+        if filters.get('status') in (None, status):
+            entry = category_counts.setdefault(category_id, {
+                'category_id': category_id,
+                'display_name': display_name or '未分类',
+                'count': 0
+            })
+            entry['count'] += count
+
+    categories = sorted(category_counts.values(), key=lambda entry: entry['count'], reverse=True)
+    return {'status': status_counts, 'category': categories}
+
+def get_task_facets(filters):
+    """计算状态和分类的分面计数（统计表或一条分组查询），返回值见 summarize_task_facets"""
+    if uses_stat_facets(filters):
+        rows = stat_facet_rows(db.session.execute(stat_facets_select()).all())
+    else:
+        rows = db.session.execute(task_facets_select(filters)).all()
+    return summarize_task_facets(rows, filters)
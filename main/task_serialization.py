@@ -0,0 +1,89 @@
+# 任务列式序列化模块 - 只查询需要的列（元组），在同一查询中关联创建者姓名，不构造ORM对象
+from functools import lru_cache
+from sqlalchemy import select
+from models import db, Task, User
+
+def _isoformat(value):
+    """日期时间转换为ISO字符串，空值保持None"""
+    return value.isoformat() if value else None
+
+def _creator_name(value):
+    """创建者不存在时显示为系统（与 Task.get_creator_display 一致）"""
+    return value or '系统'
+
+# 输出字段、对应的列和格式化函数（字段顺序与 Task.to_dict 一致）
+TASK_FIELD_COLUMNS = {
+    'id': (Task.id, None),
+    'title': (Task.title, None),
+    'description': (Task.description, None),
+    'status': (Task.status, None),
+    'progress': (Task.progress, None),
+    'planned_start_date': (Task.planned_start_date, _isoformat),
+    'planned_end_date': (Task.planned_end_date, _isoformat),
+    'assignee': (Task.assignee, None),
+    'category': (Task.category, None),
+    'creator_id': (Task.creator_id, None),
+    'creator_name': (User.full_name, _creator_name),
+    'created_at': (Task.created_at, _isoformat),
+    'updated_at': (Task.updated_at, _isoformat),
+}
+
+TASK_FIELDS = tuple(TASK_FIELD_COLUMNS)
+
+def parse_fields(value):
+    """
+    解析 fields 参数（逗号分隔的字段名）
+    返回: 字段名元组，未指定时返回全部字段
+    异常: 包含未知字段时抛出 ValueError
+    """
+    if not value:
+        return TASK_FIELDS
+    fields = tuple(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    if not fields:
+        raise ValueError('fields不能为空')
+    unknown = [field for field in fields if field not in TASK_FIELD_COLUMNS]
+    if unknown:
+        raise ValueError(f'未知字段: {", ".join(unknown)}，可选字段: {", ".join(TASK_FIELDS)}')
+    return fields
+
+def _row_columns(fields, extra_fields):
+    """字段对应的带标签列，以及是否需要关联用户表"""
+    selected = list(dict.fromkeys(tuple(fields) + tuple(extra_fields)))
+    columns = [TASK_FIELD_COLUMNS[field][0].label(field) for field in selected]
+    return columns, 'creator_name' in selected
+
+def task_rows_query(fields=TASK_FIELDS, extra_fields=()):
+    """
+    返回只查询指定字段的任务列查询，结果行的属性名与字段名相同
+    参数:
+        fields - 输出字段，按顺序排在结果行的最前面
+        extra_fields - 分页、ETag等需要但不输出的字段，追加在后面
+    只有需要创建者姓名时才关联用户表，在同一查询中取出，避免逐行懒加载
+    """
+    columns, join_creator = _row_columns(fields, extra_fields)
+    query = db.session.query(*columns).select_from(Task)
+    if join_creator:
+        query = query.outerjoin(User, Task.creator_id == User.id)
+    return query
+
+def task_rows_select(fields=TASK_FIELDS, extra_fields=()):
+    """与 task_rows_query 相同的列查询，返回 select() 语句（供异步会话执行）"""
+    columns, join_creator = _row_columns(fields, extra_fields)
+    stmt = select(*columns).select_from(Task)
+    if join_creator:
+        stmt = stmt.outerjoin(User, Task.creator_id == User.id)
+    return stmt
+
+@lru_cache(maxsize=64)
+def _formatters(fields):
+    """字段组合中需要格式化的字段位置和格式化函数"""
+    return [(index, TASK_FIELD_COLUMNS[field][1])
+            for index, field in enumerate(fields) if TASK_FIELD_COLUMNS[field][1]]
+
+def row_to_dict(row, fields=TASK_FIELDS):
+    """把 task_rows_query 的结果行转换为字典，包含全部字段时与 Task.to_dict 相同"""
+    fields = tuple(fields)
+    values = list(row)[:len(fields)]
+    for index, formatter in _formatters(fields):
+        values[index] = formatter(values[index])
+    return dict(zip(fields, values))
@@ -0,0 +1,20 @@
+# 生产环境WSGI入口
+# 启动前需先执行一次 flask --app app init-db（应用启动时不创建表和默认数据）
+# 使用 gunicorn:  gunicorn -w 4 --threads 8 -b 0.0.0.0:8000 wsgi:application
+# 或直接运行:     python wsgi.py （已安装waitress时使用waitress，否则使用多线程的Werkzeug服务器）
+import os
+from app import app
+
+application = app
+
+if __name__ == '__main__':
+    host = os.environ.get('HOST', '0.0.0.0')
+    port = int(os.environ.get('PORT', 8000))
+    threads = int(os.environ.get('THREADS', 8))
+    try:
+        from waitress import serve
+    except ImportError:
+        print('未安装waitress，使用Werkzeug多线程服务器（关闭调试模式）')
+        app.run(host=host, port=port, threaded=True, debug=False)
+    else:
+        serve(application, host=host, port=port, threads=threads)